@@ -0,0 +1,99 @@
+"""
+Benchmark kebijakan tipe extract (pipeline/manifest.py).
+
+Membuat detail_frs / kelas / frs sintetis dengan tipe seperti hasil
+pd.read_sql mentah (int64, string object, tanggal sebagai datetime.date),
+lalu membandingkan footprint memori dan waktu merge + groupby ala
+transform_fact fact_perubahan_kelas sebelum dan sesudah apply_dtypes().
+
+Cek regresi reduksi memori (dan nilai yang tidak berubah) ada di
+tests/test_manifest.py; script ini untuk angka di skala besar. Keluar dengan
+kode 1 kalau hasil join + groupby berbeda.
+
+    python benchmark/bench_dtypes.py [jumlah_baris_detail]
+"""
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline.manifest import apply_dtypes
+
+N_DETAIL = 1_000_000
+N_FRS = 50_000
+N_KELAS = 2_000
+
+
+def make_raw(n_detail, seed=0):
+    """Tabel source sintetis dengan tipe seperti hasil read_sql tanpa konversi."""
+    rng = np.random.default_rng(seed)
+    days = [date(2023, 1, 1) + timedelta(days=int(d)) for d in range(365)]
+    kode = np.array([f"IF{i:04d}" for i in range(N_KELAS // 4)], dtype=object)
+
+    detail = pd.DataFrame({
+        'id': np.arange(1, n_detail + 1),
+        'frs_id': rng.integers(1, N_FRS + 1, n_detail),
+        'kelas_id': rng.integers(1, N_KELAS + 1, n_detail),
+        'action': np.where(rng.random(n_detail) < 0.8, 'ADD', 'DROP').astype(object),
+        'tanggal': np.array(days, dtype=object)[rng.integers(0, len(days), n_detail)],
+    })
+    kelas = pd.DataFrame({
+        'id': np.arange(1, N_KELAS + 1),
+        'kode_mata_kuliah': kode[rng.integers(0, len(kode), N_KELAS)],
+    })
+    frs = pd.DataFrame({
+        'id': np.arange(1, N_FRS + 1),
+        'nrp': rng.integers(5026200000, 5026239999, N_FRS).astype(str).astype(object),
+        'semester': rng.integers(1, 9, N_FRS),
+    })
+    return {'detail_frs': detail, 'kelas': kelas, 'frs': frs}
+
+
+def memory_mb(tables):
+    return sum(df.memory_usage(deep=True).sum() for df in tables.values()) / 1e6
+
+
+def join_and_count(tables):
+    """Rantai join + hitung ADD/DROP seperti transform_fact fact_perubahan_kelas."""
+    df = tables['detail_frs'].merge(tables['kelas'], left_on='kelas_id', right_on='id', how='left')
+    df = df.merge(tables['frs'], left_on='frs_id', right_on='id', how='left')
+    is_add = (df['action'] == 'ADD').to_numpy()
+    df = df.assign(jumlah_add=is_add.astype(np.int32), jumlah_drop=(~is_add).astype(np.int32))
+    return df.groupby(['nrp', 'kode_mata_kuliah', 'semester'], observed=True)[['jumlah_add', 'jumlah_drop']].sum()
+
+
+def timed(func, *args, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(n_detail=N_DETAIL):
+    raw = make_raw(n_detail)
+    typed = {name: apply_dtypes(df.copy()) for name, df in raw.items()}
+
+    mem_raw, mem_typed = memory_mb(raw), memory_mb(typed)
+    t_raw, res_raw = timed(join_and_count, raw)
+    t_typed, res_typed = timed(join_and_count, typed)
+
+    print(f"detail_frs: {n_detail:,} baris")
+    for name in raw:
+        print(f"  {name:<11} {raw[name].memory_usage(deep=True).sum() / 1e6:8.1f} MB → "
+              f"{typed[name].memory_usage(deep=True).sum() / 1e6:8.1f} MB")
+    print(f"memori total : {mem_raw:8.1f} MB → {mem_typed:8.1f} MB ({1 - mem_typed / mem_raw:.0%} lebih kecil)")
+    print(f"join+groupby : {t_raw:8.3f} s  → {t_typed:8.3f} s  ({t_raw / t_typed:.1f}x)")
+
+    same = res_raw['jumlah_add'].sum() == res_typed['jumlah_add'].sum() and len(res_raw) == len(res_typed)
+    print(f"hasil sama   : {same}")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else N_DETAIL))
@@ -0,0 +1,212 @@
+"""
+Benchmark end-to-end semua loader historical / incremental.
+
+Setiap node DAG (pipeline/runner.py) dijalankan berurutan di subprocess
+sendiri, supaya peak RSS per loader terukur terpisah. Waktu dan baris per fase
+diambil dari record @step (pipeline/metrics.py) yang ditulis subprocess ke
+FRS_METRICS_FILE sementara, jadi angkanya sama dengan metrics produksi. Waktu
+fase adalah jumlah durasi step di fase itu dan dijumlah lintas thread
+extract_many, jadi untuk extract paralel angkanya setara waktu serial, bukan
+wall-clock.
+
+Hasil (wall time, peak RSS, baris & baris/detik per fase) ditulis ke JSON
+yang bisa dibandingkan antar commit dengan --compare.
+
+Loader memakai MySQL (LOAD DATA, SELECT ... FOR UPDATE), jadi database
+benchmark harus MySQL dengan skema OLAP sudah dibuat; isi source dengan
+benchmark/synthetic_frs.py. Database diarahkan lewat env FRS_DB_URI,
+FRS_SOURCE_DB, FRS_TARGET_DB dan FRS_DB_PASSWORD (pipeline/db.py).
+
+Contoh:
+    FRS_SOURCE_DB=frs_bench FRS_TARGET_DB=olap_bench FRS_DB_PASSWORD=... \\
+        python benchmark/bench_e2e.py --mode historical --generate 1000000
+    python benchmark/bench_e2e.py --compare benchmark/results/a.json benchmark/results/b.json
+"""
+import argparse
+import importlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline.metrics import PHASES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, 'benchmark', 'results')
+RESULT_MARKER = '[BENCH-RESULT] '
+
+
+# === METRICS (dari pipeline/metrics.py) ===
+def read_metrics(path):
+    """Record @step dari file JSON lines FRS_METRICS_FILE; kosong kalau tidak ada."""
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def phase_report(records):
+    """Jumlah detik dan baris keluar per fase dari record @step."""
+    report = {}
+    for phase in PHASES:
+        steps = [r for r in records if r['phase'] == phase]
+        seconds = sum(r['seconds'] for r in steps)
+        rows = sum(r['rows_out'] or 0 for r in steps)
+        report[phase] = {
+            'seconds': round(seconds, 4),
+            'rows': rows,
+            'rows_per_sec': round(rows / seconds) if seconds > 0 else None,
+            'steps': len(steps),
+        }
+    return report
+
+
+# === SUBPROCESS ===
+def run_child(mode, node):
+    """Jalankan satu node di proses ini dan cetak hasilnya sebagai JSON."""
+    from pipeline.db import get_engines
+    from pipeline.runner import DAGS
+
+    spec = DAGS[mode][node]
+    get_engines()
+    module = importlib.import_module(spec['module'])
+
+    status, error = 'ok', None
+    start = time.perf_counter()
+    try:
+        getattr(module, spec['entry'])()
+    except Exception as e:
+        status, error = 'failed', f"{type(e).__name__}: {e}"
+    wall = time.perf_counter() - start
+
+    result = {
+        'status': status,
+        'error': error,
+        'wall_seconds': round(wall, 4),
+        # ru_maxrss dalam KB di Linux
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+    print(RESULT_MARKER + json.dumps(result), flush=True)
+
+
+# === HARNESS (proses induk) ===
+def topological_order(nodes):
+    order, done = [], set()
+
+    def visit(name):
+        if name in done:
+            return
+        for dep in nodes[name]['deps']:
+            visit(dep)
+        done.add(name)
+        order.append(name)
+
+    for name in nodes:
+        visit(name)
+    return order
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run_node_subprocess(mode, node, verbose=False):
+    with tempfile.TemporaryDirectory() as tmp:
+        metrics_file = os.path.join(tmp, 'metrics.jsonl')
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--child', mode, node],
+            cwd=ROOT, capture_output=True, text=True,
+            env={**os.environ, 'FRS_METRICS_FILE': metrics_file},
+        )
+        records = read_metrics(metrics_file)
+    if verbose:
+        sys.stdout.write(proc.stdout)
+    for line in reversed(proc.stdout.splitlines()):
+        if line.startswith(RESULT_MARKER):
+            result = json.loads(line[len(RESULT_MARKER):])
+            result['phases'] = phase_report(records)
+            return result
+    return {'status': 'crashed', 'error': proc.stderr.strip().splitlines()[-1:] or None}
+
+
+def run_benchmark(mode, only=None, detail_rows=None, verbose=False):
+    from pipeline.runner import DAGS, select_nodes
+
+    nodes = select_nodes(DAGS[mode], only)
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'mode': mode,
+        'detail_rows': detail_rows,
+        'nodes': {},
+    }
+    for node in topological_order(nodes):
+        result = run_node_subprocess(mode, node, verbose)
+        report['nodes'][node] = result
+        print(f"[BENCH] {node:<28} {result['status']:<8} "
+              f"{result.get('wall_seconds', 0):8.2f}s  {result.get('peak_rss_mb', 0):8.1f} MB")
+    return report
+
+
+def compare(old_path, new_path):
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    print(f"{old['commit']} → {new['commit']} ({new['mode']})")
+    print(f"{'node':<28}{'wall lama':>11}{'wall baru':>11}{'rasio':>8}{'RSS lama':>11}{'RSS baru':>11}")
+    for node, result in new['nodes'].items():
+        before = old['nodes'].get(node)
+        if not before or result['status'] != 'ok' or before['status'] != 'ok':
+            print(f"{node:<28} (tidak dibandingkan: {before and before['status']} → {result['status']})")
+            continue
+        ratio = result['wall_seconds'] / before['wall_seconds'] if before['wall_seconds'] else float('nan')
+        print(f"{node:<28}{before['wall_seconds']:>10.2f}s{result['wall_seconds']:>10.2f}s{ratio:>7.2f}x"
+              f"{before['peak_rss_mb']:>9.1f}MB{result['peak_rss_mb']:>9.1f}MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark end-to-end loader ETL FRS.")
+    parser.add_argument('--mode', choices=['historical', 'incremental'], default='historical')
+    parser.add_argument('--only', nargs='*', help="Node ini saja (beserta dependensinya)")
+    parser.add_argument('--generate', type=int, metavar='DETAIL_ROWS',
+                        help="Isi ulang database source dengan data sintetis sebelum benchmark")
+    parser.add_argument('--output', help="Path laporan JSON (default benchmark/results/<mode>-<commit>.json)")
+    parser.add_argument('--verbose', action='store_true', help="Tampilkan output loader")
+    parser.add_argument('--compare', nargs=2, metavar=('LAMA', 'BARU'), help="Bandingkan dua laporan JSON")
+    parser.add_argument('--child', nargs=2, metavar=('MODE', 'NODE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(*args.child)
+        return
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    if args.generate:
+        from pipeline.db import get_engines
+        from synthetic_frs import generate, load
+
+        source_engine, _ = get_engines()
+        load(generate(args.generate), source_engine)
+
+    report = run_benchmark(args.mode, args.only, args.generate, args.verbose)
+    output = args.output or os.path.join(RESULTS_DIR, f"{args.mode}-{report['commit']}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"[BENCH] Laporan ditulis ke {output}")
+
+
+if __name__ == "__main__":
+    main()
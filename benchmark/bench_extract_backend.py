@@ -0,0 +1,82 @@
+"""
+Bandingkan backend extract thread (pd.read_sql sinkron) dan async
+(pipeline/async_extract.py) pada database yang sama.
+
+Yang diukur: semua tabel source dibaca bersamaan lewat extract_many, lalu
+read_table_where_in detail_frs untuk sebagian frs_id (banyak chunk IN).
+Hasil kedua backend dicek sama. Database bisa MySQL lokal atau SQLite
+sebagai pengganti (butuh aiosqlite); isi dengan benchmark/synthetic_frs.py
+atau --generate.
+
+Contoh:
+    python benchmark/bench_extract_backend.py --uri sqlite:///frs_bench.db --generate 100000
+    python benchmark/bench_extract_backend.py \\
+        --uri "mysql+mysqlconnector://root:pw@localhost/frs_bench"
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+from sqlalchemy import create_engine
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline import async_extract
+from pipeline.extract import extract_many, read_table, read_table_where_in
+
+TABLES = ['jurusan', 'dosen_wali', 'mahasiswa', 'mata_kuliah', 'kelas', 'frs',
+          'pembayaran', 'detail_frs', 'log_frs', 'nilai_mahasiswa', 'pembatalan_frs']
+
+
+def run(engine, frs_ids):
+    start = time.perf_counter()
+    tables = extract_many({name: (lambda name=name: read_table(name, engine)) for name in TABLES})
+    t_tables = time.perf_counter() - start
+
+    start = time.perf_counter()
+    detail = read_table_where_in('detail_frs', 'frs_id', frs_ids, engine)
+    t_keys = time.perf_counter() - start
+    return t_tables, t_keys, tables, detail
+
+
+def same(a, b, sort_by='id'):
+    a = a.sort_values(sort_by, ignore_index=True)
+    b = b.sort_values(sort_by, ignore_index=True)
+    return a.astype(object).equals(b.astype(object))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark backend extract thread vs async.")
+    parser.add_argument('--uri', required=True, help="SQLAlchemy URI database source")
+    parser.add_argument('--generate', type=int, metavar='DETAIL_ROWS', help="Isi ulang database dengan data sintetis")
+    parser.add_argument('--keys', type=int, default=20_000, help="Jumlah frs_id untuk read_table_where_in")
+    args = parser.parse_args()
+
+    engine = create_engine(args.uri)
+    if args.generate:
+        from synthetic_frs import generate, load
+        load(generate(args.generate), engine)
+
+    frs_ids = pd.read_sql(f"SELECT id FROM frs LIMIT {args.keys}", engine)['id']
+
+    os.environ[async_extract.BACKEND_ENV] = 'thread'
+    thread = run(engine, frs_ids)
+
+    os.environ[async_extract.BACKEND_ENV] = 'async'
+    if not async_extract.is_enabled(engine):
+        print("Backend async tidak tersedia (butuh greenlet + aiomysql/asyncmy/aiosqlite).")
+        return 1
+    aio = run(engine, frs_ids)
+
+    equal = all(same(thread[2][name], aio[2][name], thread[2][name].columns[0]) for name in TABLES) \
+        and same(thread[3], aio[3])
+    print(f"{'backend':<8}{'semua tabel':>14}{'where_in':>12}")
+    for name, result in (('thread', thread), ('async', aio)):
+        print(f"{name:<8}{result[0]:>13.2f}s{result[1]:>11.2f}s")
+    print(f"hasil sama: {equal}")
+    return 0 if equal else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""
+Benchmark agregasi transform_fact() fact_perubahan_kelas: versi lama (dua
+groupby terfilter + drop_duplicates + merge balik + merge sks + groupby ketiga)
+dibanding group_first_and_sums (pipeline/transforms.py) dalam satu pass.
+
+Input sintetis sudah berbentuk detail_frs yang di-join ke kelas / frs / dim
+(mahasiswa_id, semester, waktu_id, status), default 5 juta baris. Kedua versi
+mulai dari join ke dim_mata_kuliah supaya biaya kolom sks ikut dihitung.
+Hasil dicek sama persis, lalu dicetak waktu terbaik dan jumlah operasi
+groupby / merge / drop_duplicates yang dijalankan masing-masing versi.
+
+    python benchmark/bench_perubahan.py [jumlah_baris]
+"""
+import os
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline.transforms import group_first_and_sums
+
+N_ROWS = 5_000_000
+GROUP_KEYS = ['mahasiswa_id', 'mata_kuliah_id', 'semester']
+RESULT_COLUMNS = ['mata_kuliah_id', 'mahasiswa_id', 'status_perubahan_kelas_id',
+                  'waktu_id', 'jumlah_drop', 'jumlah_add', 'sks_setelah_perubahan']
+
+
+# === DATA SINTETIS ===
+def make_inputs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    n_mk = 300
+    n_mhs = max(1, n // 40)
+    kode = np.array([f"IF{184100 + i}" for i in range(n_mk)], dtype=object)
+    dim_mk = pd.DataFrame({
+        'kode_mata_kuliah': kode,
+        'mata_kuliah_id': pd.array(np.arange(1, n_mk + 1), dtype='Int32'),
+        'sks': pd.array(rng.integers(2, 5, n_mk), dtype='Int16'),
+    })
+
+    action = rng.choice(['ADD', 'DROP'], n, p=[0.85, 0.15])
+    mahasiswa_id = pd.array(rng.integers(1, n_mhs + 1, n), dtype='Int32')
+    # Sedikit mahasiswa tidak ditemukan di dim (NULL), seperti data asli
+    mahasiswa_id[rng.random(n) < 0.001] = pd.NA
+    detail = pd.DataFrame({
+        'kode_mata_kuliah': kode[rng.integers(0, n_mk, n)],
+        'mahasiswa_id': mahasiswa_id,
+        'semester': pd.array(rng.integers(1, 9, n), dtype='Int16'),
+        'waktu_id': pd.array(rng.integers(1, 1500, n), dtype='Int32'),
+        'action': action,
+        'status_perubahan_kelas_id': np.where(action == 'ADD', 1, 2),
+    })
+    return detail, dim_mk
+
+
+# === VERSI LAMA ===
+def old_aggregate(df_detail, df_dim_mk):
+    df_detail = df_detail.merge(df_dim_mk[['kode_mata_kuliah', 'mata_kuliah_id']], on='kode_mata_kuliah', how='left')
+
+    jumlah_add = df_detail[df_detail['action'] == 'ADD'].groupby(GROUP_KEYS).size().reset_index(name='jumlah_add')
+    jumlah_drop = df_detail[df_detail['action'] == 'DROP'].groupby(GROUP_KEYS).size().reset_index(name='jumlah_drop')
+
+    df_result = df_detail.drop_duplicates(subset=GROUP_KEYS)
+    df_result = df_result.merge(jumlah_add, on=GROUP_KEYS, how='left')
+    df_result = df_result.merge(jumlah_drop, on=GROUP_KEYS, how='left')
+    df_result['jumlah_add'] = df_result['jumlah_add'].fillna(0).astype(int)
+    df_result['jumlah_drop'] = df_result['jumlah_drop'].fillna(0).astype(int)
+
+    df_sks = df_detail[df_detail['action'] == 'ADD'].merge(df_dim_mk[['mata_kuliah_id', 'sks']], on='mata_kuliah_id', how='left')
+    sks_sum = df_sks.groupby(GROUP_KEYS)['sks'].sum().reset_index(name='sks_setelah_perubahan')
+    df_result = df_result.merge(sks_sum, on=GROUP_KEYS, how='left')
+    df_result['sks_setelah_perubahan'] = df_result['sks_setelah_perubahan'].fillna(0).astype(int)
+    return df_result[RESULT_COLUMNS]
+
+
+# === VERSI SATU PASS (sama dengan loader) ===
+def new_aggregate(df_detail, df_dim_mk):
+    df_detail = df_detail.merge(df_dim_mk[['kode_mata_kuliah', 'mata_kuliah_id', 'sks']], on='kode_mata_kuliah', how='left')
+
+    is_add = df_detail['action'] == 'ADD'
+    df_result = group_first_and_sums(df_detail, GROUP_KEYS, {
+        'jumlah_add': is_add,
+        'jumlah_drop': df_detail['action'] == 'DROP',
+        'sks_setelah_perubahan': df_detail['sks'].where(is_add, 0),
+    })
+    return df_result[RESULT_COLUMNS]
+
+
+# === PENGUKURAN ===
+COUNTED_OPS = ('groupby', 'merge', 'drop_duplicates')
+
+
+def count_ops(func, *args):
+    """Jalankan func sekali sambil menghitung panggilan DataFrame.groupby / merge / drop_duplicates."""
+    counts = Counter()
+    originals = {name: getattr(pd.DataFrame, name) for name in COUNTED_OPS}
+
+    def counting(name, original):
+        def wrapper(self, *a, **kw):
+            counts[name] += 1
+            return original(self, *a, **kw)
+        return wrapper
+
+    try:
+        for name, original in originals.items():
+            setattr(pd.DataFrame, name, counting(name, original))
+        func(*args)
+    finally:
+        for name, original in originals.items():
+            setattr(pd.DataFrame, name, original)
+    return counts
+
+
+def best_of(func, *args, repeat=3):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(n=N_ROWS):
+    detail, dim_mk = make_inputs(n)
+    print(f"{n:,} baris detail_frs")
+
+    ops_old = count_ops(old_aggregate, detail, dim_mk)
+    ops_new = count_ops(new_aggregate, detail, dim_mk)
+    t_old, r_old = best_of(old_aggregate, detail, dim_mk)
+    t_new, r_new = best_of(new_aggregate, detail, dim_mk)
+
+    equal = r_old.reset_index(drop=True).astype(object).equals(r_new.reset_index(drop=True).astype(object))
+
+    print(f"{'versi':<10}{'waktu':>10}{'groupby':>10}{'merge':>8}{'drop_dup':>10}")
+    for name, t, ops in (('lama', t_old, ops_old), ('satu pass', t_new, ops_new)):
+        print(f"{name:<10}{t:>9.2f}s{ops['groupby']:>10}{ops['merge']:>8}{ops['drop_duplicates']:>10}")
+    print(f"speedup {t_old / t_new:.1f}x, {len(r_new):,} baris hasil, hasil sama: {equal}")
+    return 0 if equal else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else N_ROWS))
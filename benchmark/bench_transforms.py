@@ -0,0 +1,130 @@
+"""
+Micro-benchmark pipeline/transforms.py terhadap versi per baris (apply/lambda)
+yang sebelumnya ada di loader dim_* dan fact_*.
+
+Setiap kasus dijalankan pada input sintetis (default 1 juta baris), hasilnya
+dicek sama persis dengan versi lama, lalu waktu terbaik dari beberapa ulangan
+dicetak beserta speedup.
+
+    python benchmark/bench_transforms.py [jumlah_baris]
+"""
+import os
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline import transforms
+
+N_ROWS = 1_000_000
+
+
+# === VERSI LAMA (per baris) ===
+def old_clean_dosen(name):
+    if not isinstance(name, str):
+        return name
+    name = name.strip().title()
+    name = name.replace('.', '. ').replace('  ', ' ')
+    name = name.replace('St ', 'St. ').replace('Dr ', 'Dr. ').replace('Phd', 'Ph.D').replace('Ph.D.', 'Ph.D')
+    name = name.replace('Mkom', 'M.Kom').replace('Skom', 'S.Kom').replace('Spt', 'S.Pt')
+    return name.strip()
+
+
+def old_normalize_degree(nama):
+    replacements = {
+        'S.T': 'ST', 'S.T.': 'ST',
+        'M.T': 'MT', 'M.T.': 'MT',
+        'Ph.D': 'PhD', 'Ph.D.': 'PhD'
+    }
+    for old, new in replacements.items():
+        nama = nama.replace(old, new)
+    return nama
+
+
+def old_clean_text(text):
+    if pd.isna(text): return text
+    text = text.strip().title()
+    text = re.sub(r'\s+', ' ', text)
+    return text
+
+
+# === DATA SINTETIS ===
+def make_inputs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    first = ['budi', 'ani', 'siti', 'agus', 'dewi', 'rudi', 'rina', 'joko']
+    last = ['santoso', 'wijaya', 'lestari', 'pratama', 'kusuma']
+    degree = ['mkom', 'skom', 's.t.', 'm.t.', 'phd', 'ph.d.', 'spt', '']
+    dosen = np.array([
+        f" dr {f} {l}  {d} " for f in first for l in last for d in degree
+    ], dtype=object)
+    names = dosen[rng.integers(0, len(dosen), n)]
+    names[rng.random(n) < 0.01] = None
+
+    return {
+        'action': pd.Series(np.where(rng.random(n) < 0.8, 'ADD', 'drop'), dtype=object),
+        'status': pd.Series(rng.choice(['Disetujui', 'DITOLAK', 'menunggu'], n), dtype=object),
+        'merge': pd.Categorical(rng.choice(['both', 'left_only'], n), categories=['left_only', 'right_only', 'both']),
+        'dosen': pd.Series(names),
+        'degree': pd.Series(names).fillna('Dr. X'),
+        'mata_kuliah': pd.Series(np.array([' basis   data ', 'struktur data', ' sistem  operasi'], dtype=object)[
+            rng.integers(0, 3, n)]),
+    }
+
+
+# === KASUS ===
+def cases(inputs):
+    return [
+        ('is_drop',
+         lambda: inputs['action'].apply(lambda x: 1 if str(x).upper() == "DROP" else 0).to_numpy(),
+         lambda: transforms.flag(transforms.equals_upper(inputs['action'], 'DROP'))),
+        ('is_frs_disetujui',
+         lambda: inputs['status'].apply(lambda s: 1 if str(s).upper() == 'DISETUJUI' else 0).to_numpy(),
+         lambda: transforms.flag(transforms.equals_upper(inputs['status'], 'DISETUJUI'))),
+        ('sudah_bayar_flag',
+         lambda: pd.Series(inputs['merge']).apply(lambda x: 1 if x == 'both' else 0).to_numpy(),
+         lambda: transforms.merge_flag(inputs['merge'])),
+        ('clean_dosen',
+         lambda: inputs['dosen'].apply(old_clean_dosen),
+         lambda: transforms.clean_dosen(inputs['dosen'])),
+        ('normalize_degree',
+         lambda: inputs['degree'].apply(old_normalize_degree),
+         lambda: transforms.normalize_degree(inputs['degree'])),
+        ('clean_text',
+         lambda: inputs['mata_kuliah'].apply(old_clean_text),
+         lambda: transforms.clean_text(inputs['mata_kuliah'])),
+    ]
+
+
+def best_of(func, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def same(a, b):
+    a, b = pd.Series(np.asarray(a, dtype=object)), pd.Series(np.asarray(b, dtype=object))
+    return bool((a.fillna('<NULL>') == b.fillna('<NULL>')).all())
+
+
+def main(n=N_ROWS):
+    inputs = make_inputs(n)
+    print(f"{n:,} baris")
+    print(f"{'kasus':<18}{'per baris':>12}{'vektor':>12}{'speedup':>10}  hasil sama")
+    ok = True
+    for name, old, new in cases(inputs):
+        t_old, r_old = best_of(old)
+        t_new, r_new = best_of(new)
+        equal = same(r_old, r_new)
+        ok &= equal
+        print(f"{name:<18}{t_old:>11.3f}s{t_new:>11.3f}s{t_old / t_new:>9.1f}x  {equal}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else N_ROWS))
@@ -0,0 +1,213 @@
+"""
+Generator data FRS sintetis untuk benchmark.
+
+Menghasilkan semua tabel source yang dibaca loader (jurusan, dosen_wali,
+mahasiswa, mata_kuliah, kelas, frs, pembayaran, detail_frs, log_frs,
+nilai_mahasiswa, pembatalan_frs) dengan skala ditentukan jumlah baris
+detail_frs (10 ribu sampai 10 juta). Proporsi antar tabel mengikuti data
+asli: ±10 baris detail per FRS, 4 semester per mahasiswa, 1-3 log per FRS,
+±3% FRS dibatalkan, dan sedikit data kotor (spasi, huruf kecil, email
+tanpa '@', tanggal NULL) supaya jalur pembersihan ikut teruji.
+
+Contoh:
+    python benchmark/synthetic_frs.py --detail-rows 100000 --uri sqlite:///frs_bench.db
+    python benchmark/synthetic_frs.py --detail-rows 1000000 \\
+        --uri "mysql+mysqlconnector://root:pw@localhost/frs_bench"
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DETAIL_PER_FRS = 10
+FRS_PER_MAHASISWA = 4
+MAHASISWA_PER_DOSEN = 25
+N_JURUSAN = 20
+N_MATA_KULIAH = 300
+KELAS_PER_MK = 4
+SEMESTER_START = pd.Timestamp('2020-08-01')
+
+FIRST_NAMES = np.array(['budi', 'ani', 'siti', 'agus', 'dewi', 'rudi', 'rina', 'joko', 'putri', 'eko'])
+LAST_NAMES = np.array(['santoso', 'wijaya', 'lestari', 'pratama', 'kusuma', 'hidayat', 'saputra'])
+DEGREES = np.array(['mkom', 'S.T., M.T.', 'phd', 'Ph.D.', 'skom', 'spt', ''])
+
+
+def _names(rng, n, prefix=''):
+    first = FIRST_NAMES[rng.integers(0, len(FIRST_NAMES), n)]
+    last = LAST_NAMES[rng.integers(0, len(LAST_NAMES), n)]
+    return pd.Series(prefix + first).str.cat(pd.Series(last), sep=' ')
+
+
+def _dates(base, days, rng, spread):
+    """base (Timestamp) + days (array) + acak 0..spread hari, sebagai datetime64."""
+    offset = days + rng.integers(0, spread + 1, len(days))
+    return base + pd.to_timedelta(offset, unit='D')
+
+
+def generate(detail_rows, seed=0):
+    """Kembalikan dict nama tabel -> DataFrame untuk skala detail_rows."""
+    rng = np.random.default_rng(seed)
+    n_frs = max(1, detail_rows // DETAIL_PER_FRS)
+    n_mhs = max(1, -(-n_frs // FRS_PER_MAHASISWA))
+    n_dosen = max(1, n_mhs // MAHASISWA_PER_DOSEN)
+    n_kelas = N_MATA_KULIAH * KELAS_PER_MK
+
+    jurusan = pd.DataFrame({
+        'jurusan_id': np.arange(1, N_JURUSAN + 1),
+        'nama_jurusan': [f" sistem informasi {i} " if i % 5 == 0 else f"Teknik Informatika {i}"
+                         for i in range(1, N_JURUSAN + 1)],
+        'fakultas_id': rng.integers(1, 6, N_JURUSAN),
+        'kode_jurusan': np.arange(101, 101 + N_JURUSAN),
+    })
+
+    dosen_nama = _names(rng, n_dosen, prefix=' dr ') + ' ' + DEGREES[rng.integers(0, len(DEGREES), n_dosen)]
+    dosen_wali = pd.DataFrame({
+        'id': np.arange(1, n_dosen + 1),
+        'nama': dosen_nama,
+        'email': [f"Dosen{i}@ITS.ac.id " for i in range(1, n_dosen + 1)],
+    })
+
+    nrp = 5026200000 + np.arange(n_mhs)
+    email = pd.Series(nrp.astype(str)) + '@student.its.ac.id'
+    email[rng.random(n_mhs) < 0.01] = 'tanpa-at'
+    mahasiswa = pd.DataFrame({
+        'nrp': nrp,
+        'dosen_wali_id': rng.integers(1, n_dosen + 1, n_mhs),
+        'email': email,
+        'nama': _names(rng, n_mhs),
+        'jurusan_id': rng.integers(1, N_JURUSAN + 1, n_mhs),
+    })
+
+    kode = np.array([f"IF{184100 + i}" for i in range(N_MATA_KULIAH)], dtype=object)
+    mata_kuliah = pd.DataFrame({
+        'kode_mata_kuliah': kode,
+        'nama': [f" mata  kuliah {i} " for i in range(N_MATA_KULIAH)],
+        'sks': rng.integers(2, 5, N_MATA_KULIAH),
+    })
+    kelas = pd.DataFrame({
+        'id': np.arange(1, n_kelas + 1),
+        'kode_mata_kuliah': np.repeat(kode, KELAS_PER_MK),
+        'dosen': _names(rng, n_kelas, prefix='Dr. '),
+        'kapasitas': rng.choice([30, 40, 50], n_kelas),
+        'nama_kelas': np.tile(np.array(['A', 'b', 'C ', 'd']), N_MATA_KULIAH),
+    })
+
+    # FRS: mahasiswa ke-i punya FRS_PER_MAHASISWA semester berurutan
+    frs_mhs = np.arange(n_frs) // FRS_PER_MAHASISWA
+    semester = np.arange(n_frs) % FRS_PER_MAHASISWA + 1 + rng.integers(0, 4, n_mhs)[frs_mhs]
+    tanggal_disetujui = _dates(SEMESTER_START, (semester - 1) * 182, rng, 14)
+    tanggal_disetujui = pd.Series(tanggal_disetujui).where(rng.random(n_frs) >= 0.02)
+    frs = pd.DataFrame({
+        'id': np.arange(1, n_frs + 1),
+        'nrp': nrp[frs_mhs],
+        'pembayaran_id': np.arange(1, n_frs + 1),
+        'semester': semester,
+        'status': rng.choice(['DISETUJUI', 'DITOLAK', 'MENUNGGU'], n_frs, p=[0.85, 0.05, 0.10]),
+        'tanggal_disetujui': tanggal_disetujui.dt.date,
+    })
+
+    bayar = rng.random(n_frs) < 0.9
+    pembayaran = pd.DataFrame({
+        'id': np.arange(1, bayar.sum() + 1),
+        'nrp': frs['nrp'].to_numpy()[bayar],
+        'semester': semester[bayar],
+        'tanggal_bayar': _dates(SEMESTER_START, (semester[bayar] - 1) * 182 - 14, rng, 10).date,
+    })
+
+    detail_frs_id = rng.integers(1, n_frs + 1, detail_rows)
+    detail_frs = pd.DataFrame({
+        'id': np.arange(1, detail_rows + 1),
+        'frs_id': detail_frs_id,
+        'kelas_id': rng.integers(1, n_kelas + 1, detail_rows),
+        'action': rng.choice(['ADD', 'DROP', 'add '], detail_rows, p=[0.83, 0.15, 0.02]),
+        'tanggal': _dates(SEMESTER_START, (semester[detail_frs_id - 1] - 1) * 182, rng, 21).date,
+    })
+
+    n_log = rng.integers(1, 4, n_frs)
+    log_frs_id = np.repeat(np.arange(1, n_frs + 1), n_log)
+    log_semester = semester[log_frs_id - 1]
+    log_tanggal = _dates(SEMESTER_START, (log_semester - 1) * 182, rng, 14) \
+        + pd.to_timedelta(rng.integers(0, 86400, len(log_frs_id)), unit='s')
+    log_frs = pd.DataFrame({
+        'id': np.arange(1, len(log_frs_id) + 1),
+        'frs_id': log_frs_id,
+        'dosen_wali_id': mahasiswa['dosen_wali_id'].to_numpy()[frs_mhs[log_frs_id - 1]],
+        'status': rng.choice(['DISETUJUI', 'DITOLAK', 'menunggu '], len(log_frs_id), p=[0.7, 0.1, 0.2]),
+        'tanggal': log_tanggal,
+    })
+
+    nilai_idx = rng.integers(0, detail_rows, max(1, detail_rows // 2))
+    nilai_kelas = detail_frs['kelas_id'].to_numpy()[nilai_idx]
+    nilai = rng.integers(40, 101, len(nilai_idx)).astype(float)
+    nilai[rng.random(len(nilai_idx)) < 0.05] = np.nan
+    nilai_mahasiswa = pd.DataFrame({
+        'id': np.arange(1, len(nilai_idx) + 1),
+        'nrp': frs['nrp'].to_numpy()[detail_frs_id[nilai_idx] - 1],
+        'kelas_id': nilai_kelas,
+        'kode_mk': kelas['kode_mata_kuliah'].to_numpy()[nilai_kelas - 1],
+        'nilai': nilai,
+        'semester': semester[detail_frs_id[nilai_idx] - 1],
+    })
+
+    batal = np.flatnonzero(rng.random(n_frs) < 0.03)
+    pembatalan_frs = pd.DataFrame({
+        'id': np.arange(1, len(batal) + 1),
+        'frs_id': batal + 1,
+        'alasan': rng.choice(['sakit', 'cuti', 'pindah kelas'], len(batal)),
+        'tanggal_pengajuan': _dates(SEMESTER_START, (semester[batal] - 1) * 182 + 20, rng, 30).date,
+        'status': rng.choice(['DISETUJUI', 'DITOLAK'], len(batal)),
+    })
+
+    return {
+        'jurusan': jurusan,
+        'dosen_wali': dosen_wali,
+        'mahasiswa': mahasiswa,
+        'mata_kuliah': mata_kuliah,
+        'kelas': kelas,
+        'frs': frs,
+        'pembayaran': pembayaran,
+        'detail_frs': detail_frs,
+        'log_frs': log_frs,
+        'nilai_mahasiswa': nilai_mahasiswa,
+        'pembatalan_frs': pembatalan_frs,
+    }
+
+
+def load(tables, engine):
+    """
+    Tulis ulang (replace) semua tabel ke engine. MySQL memakai
+    pipeline.bulk_load (LOAD DATA untuk tabel besar), SQLite memakai to_sql.
+    """
+    for name, df in tables.items():
+        start = time.perf_counter()
+        if engine.dialect.name == 'mysql':
+            from pipeline.bulk_load import bulk_load
+            df.head(0).to_sql(name, engine, if_exists='replace', index=False)
+            bulk_load(df, name, engine)
+        else:
+            df.to_sql(name, engine, if_exists='replace', index=False, chunksize=50_000)
+        print(f"[SYNTHETIC] {name}: {len(df):,} baris ({time.perf_counter() - start:.1f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Buat data FRS sintetis untuk benchmark.")
+    parser.add_argument('--detail-rows', type=int, default=100_000, help="Jumlah baris detail_frs")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--uri', required=True, help="SQLAlchemy URI database source tujuan")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    tables = generate(args.detail_rows, seed=args.seed)
+    print(f"[SYNTHETIC] {sum(len(df) for df in tables.values()):,} baris dibuat "
+          f"({time.perf_counter() - start:.1f}s)")
+    load(tables, create_engine(args.uri))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Komponen bersama untuk loader di one_time_historical/ dan one_time_incremental/."""
@@ -0,0 +1,111 @@
+"""
+Backend extract async (opsional) lewat driver MySQL async.
+
+Set FRS_EXTRACT_BACKEND=async supaya read_table / read_query /
+read_table_where_in (pipeline.extract) membaca lewat SQLAlchemy asyncio dengan
+driver aiomysql (default) atau asyncmy (FRS_ASYNC_DRIVER=asyncmy). SQLite,
+mis. database uji atau benchmark, memakai aiosqlite.
+
+Semua query dijalankan di satu event loop pada thread latar, dengan satu
+async engine per database. Thread extract_many hanya menunggu hasil, jadi
+waktu tunggu jaringan ke frs_paling_fix dan olap_frs saling tumpang tindih
+di event loop yang sama. read_table_where_in mengirim semua chunk IN (...)
+sekaligus (asyncio.gather), bukan satu per satu. Jumlah query bersamaan per
+database dibatasi POOL_SIZE supaya tidak menunggu pool sampai timeout.
+
+Hasilnya tetap DataFrame (pd.read_sql di atas koneksi async lewat run_sync),
+jadi call site extract_table / extract_dim tidak berubah. Butuh greenlet dan
+drivernya; kalau tidak terpasang, extract kembali ke backend thread biasa.
+"""
+import asyncio
+import importlib.util
+import os
+import threading
+
+import pandas as pd
+
+from pipeline.db import POOL_SIZE
+
+try:
+    from sqlalchemy.ext.asyncio import create_async_engine
+    import greenlet  # noqa: F401  (dibutuhkan AsyncConnection.run_sync)
+except ImportError:
+    create_async_engine = None
+
+BACKEND_ENV = 'FRS_EXTRACT_BACKEND'
+DRIVER_ENV = 'FRS_ASYNC_DRIVER'
+
+_lock = threading.Lock()
+_loop = None
+_warned = False
+# URL sync engine -> (async engine, semaphore); hanya diakses dari thread event loop
+_engines = {}
+
+
+def _driver(engine):
+    backend = engine.url.get_backend_name()
+    if backend == 'sqlite':
+        return 'aiosqlite'
+    return os.environ.get(DRIVER_ENV, 'aiomysql')
+
+
+def is_enabled(engine):
+    """Backend async aktif kalau FRS_EXTRACT_BACKEND=async dan greenlet + driver terpasang."""
+    global _warned
+    if os.environ.get(BACKEND_ENV, 'thread').lower() != 'async':
+        return False
+    driver = _driver(engine)
+    if create_async_engine is None or importlib.util.find_spec(driver) is None:
+        if not _warned:
+            print(f"[EXTRACT] ⚠️ {BACKEND_ENV}=async tapi greenlet/{driver} tidak terpasang, pakai backend thread")
+            _warned = True
+        return False
+    return True
+
+
+def _get_loop():
+    """Event loop bersama per proses, jalan di thread daemon."""
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name='extract-async', daemon=True).start()
+    return _loop
+
+
+def _get_async_engine(engine):
+    key = engine.url.render_as_string(hide_password=False)
+    if key not in _engines:
+        url = engine.url.set(drivername=f"{engine.url.get_backend_name()}+{_driver(engine)}")
+        kwargs = {} if url.get_backend_name() == 'sqlite' else {
+            'pool_size': POOL_SIZE,
+            'pool_pre_ping': True,
+        }
+        _engines[key] = (create_async_engine(url, **kwargs), asyncio.Semaphore(POOL_SIZE))
+    return _engines[key]
+
+
+async def _read(engine, sql, params):
+    async_engine, semaphore = _get_async_engine(engine)
+    async with semaphore:
+        async with async_engine.connect() as conn:
+            return await conn.run_sync(lambda sync_conn: pd.read_sql(sql, sync_conn, params=params))
+
+
+def _run(coro):
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
+
+
+def read_sql(sql, engine, params=None):
+    """pd.read_sql lewat driver async; dipanggil dari thread mana saja (memblok sampai selesai)."""
+    return _run(_read(engine, sql, params))
+
+
+def read_sql_many(queries, engine):
+    """
+    Jalankan banyak (sql, params) ke satu database bersamaan di event loop,
+    kembalikan list DataFrame dengan urutan yang sama.
+    """
+    async def gather():
+        return await asyncio.gather(*(_read(engine, sql, params) for sql, params in queries))
+    return _run(gather())
@@ -0,0 +1,117 @@
+"""
+Bulk load DataFrame ke MySQL.
+
+Dua jalur:
+- 'multi'     : to_sql(method='multi') dengan chunksize besar, satu INSERT banyak baris
+- 'load_data' : tulis TSV sementara lalu LOAD DATA LOCAL INFILE (paling cepat untuk tabel besar)
+
+bulk_load() memilih otomatis berdasarkan jumlah baris dan mencetak baris/detik.
+Catatan: LOAD DATA LOCAL memperlakukan duplicate key seperti IGNORE (jadi warning,
+bukan error). Loader yang butuh IntegrityError harus memakai method='multi'.
+"""
+import csv
+import os
+import tempfile
+import time
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+
+from pipeline import dim_cache
+
+# Baris per statement INSERT untuk jalur 'multi'
+MULTI_ROW_CHUNKSIZE = 1000
+# Di atas jumlah baris ini pakai LOAD DATA LOCAL INFILE
+LOAD_DATA_THRESHOLD = 20_000
+
+
+def choose_method(n_rows):
+    return 'load_data' if n_rows >= LOAD_DATA_THRESHOLD else 'multi'
+
+
+def _load_multi(df, table_name, conn):
+    df.to_sql(
+        table_name,
+        conn,
+        if_exists='append',
+        index=False,
+        method='multi',
+        chunksize=MULTI_ROW_CHUNKSIZE,
+    )
+
+
+def _write_tsv(df, path):
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype == bool:
+            df[col] = df[col].astype(int)
+        elif df[col].dtype == object or str(df[col].dtype) in ('string', 'str', 'category'):
+            # Backslash adalah escape char default LOAD DATA
+            df[col] = df[col].map(lambda v: v.replace('\\', '\\\\') if isinstance(v, str) else v)
+    df.to_csv(
+        path,
+        sep='\t',
+        header=False,
+        index=False,
+        na_rep='\\N',
+        quoting=csv.QUOTE_MINIMAL,
+        quotechar='"',
+        lineterminator='\n',
+        date_format='%Y-%m-%d %H:%M:%S',
+    )
+
+
+def _load_data(df, table_name, conn):
+    fd, path = tempfile.mkstemp(prefix=f'{table_name}_', suffix='.tsv')
+    os.close(fd)
+    try:
+        _write_tsv(df, path)
+        columns = ', '.join(f'`{c}`' for c in df.columns)
+        sql = (
+            f"LOAD DATA LOCAL INFILE '{path.replace(os.sep, '/')}' "
+            f"INTO TABLE {table_name} "
+            "FIELDS TERMINATED BY '\\t' OPTIONALLY ENCLOSED BY '\"' "
+            "LINES TERMINATED BY '\\n' "
+            f"({columns})"
+        )
+        conn.exec_driver_sql(sql)
+    finally:
+        os.remove(path)
+
+
+def _load(df, table_name, conn, method):
+    if method == 'load_data':
+        try:
+            _load_data(df, table_name, conn)
+            return method
+        except DBAPIError as e:
+            # mis. local_infile dimatikan di server → turun ke multi-row INSERT
+            print(f"[BULK] LOAD DATA gagal untuk {table_name} ({e.orig}), pakai multi-row INSERT")
+    _load_multi(df, table_name, conn)
+    return 'multi'
+
+
+def bulk_load(df, table_name, con, method=None):
+    """
+    Append df ke table_name. con boleh Engine (dibuka transaksi sendiri) atau
+    Connection yang sudah di dalam transaksi (mis. bersama update etl_state).
+    method: None (otomatis), 'multi', atau 'load_data'.
+    """
+    n_rows = len(df)
+    if n_rows == 0:
+        return 0
+
+    method = method or choose_method(n_rows)
+    start = time.perf_counter()
+    if isinstance(con, Engine):
+        with con.begin() as conn:
+            used = _load(df, table_name, conn, method)
+    else:
+        used = _load(df, table_name, con, method)
+    elapsed = time.perf_counter() - start
+    # Index lookup dimensi yang baru ditulis sudah basi
+    dim_cache.invalidate(table_name)
+
+    rate = n_rows / elapsed if elapsed > 0 else float('inf')
+    print(f"[BULK] {table_name} → {n_rows} baris via {used} ({elapsed:.2f}s, {rate:,.0f} baris/detik)")
+    return n_rows
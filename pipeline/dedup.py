@@ -0,0 +1,108 @@
+"""
+Insert baris fakta yang key-nya belum ada, dengan anti-join di MySQL.
+
+Sebelumnya loader incremental menarik seluruh (mahasiswa_id, mata_kuliah_id,
+waktu_id) dari tabel fakta ke pandas lalu merge indicator=True, jadi setiap
+run biayanya O(ukuran fakta). Sekarang kandidat ditulis ke staging table dan
+disaring di server:
+
+    INSERT INTO fact (id, ...) SELECT ... FROM staging s
+    WHERE NOT EXISTS (SELECT 1 FROM fact t WHERE t.key <=> s.key ...)
+
+dengan index komposit pada kolom key di tabel fakta. Perbandingan memakai
+<=> (NULL-safe) supaya key NULL dianggap sama seperti merge pandas sebelumnya.
+CREATE INDEX memicu implicit commit di MySQL, jadi ensure_key_index dipanggil
+loader di koneksinya sendiri sebelum transaksi load dibuka.
+Index sengaja tidak UNIQUE: fakta historis memang bisa punya beberapa baris
+dengan key yang sama (mis. ADD dan DROP di hari yang sama).
+"""
+import threading
+
+from sqlalchemy import text
+
+from pipeline.db import get_engines
+from pipeline.keys import reserve_block
+from pipeline.staging import join_condition, stage_frame
+
+_lock = threading.Lock()
+_indexed = set()
+
+
+def ensure_key_index(table, key_columns, engine):
+    """
+    Buat index komposit (key_columns) di table kalau belum ada index dengan awalan itu.
+    Jalan di koneksi sendiri; panggil sebelum engine.begin() transaksi load.
+    """
+    key = (table, tuple(key_columns))
+    with _lock:
+        if key in _indexed:
+            return
+
+    with engine.begin() as conn:
+        _create_key_index(table, key_columns, conn)
+
+    with _lock:
+        _indexed.add(key)
+
+
+def _create_key_index(table, key_columns, conn):
+    rows = conn.execute(text("""
+        SELECT index_name, column_name
+        FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = :table
+        ORDER BY index_name, seq_in_index
+    """), {'table': table}).fetchall()
+    indexes = {}
+    for index_name, column_name in rows:
+        indexes.setdefault(index_name, []).append(column_name.lower())
+
+    wanted = [c.lower() for c in key_columns]
+    if not any(columns[:len(wanted)] == wanted for columns in indexes.values()):
+        name = f"idx_{table}_key"
+        print(f"[DEDUP] Membuat index {name} ({', '.join(key_columns)}) di {table}")
+        conn.execute(text(f"CREATE INDEX {name} ON {table} ({', '.join(key_columns)})"))
+
+
+def insert_new_rows(df, table, id_column, key_columns, conn, existing_max_id=None):
+    """
+    Insert baris df yang key_columns-nya belum ada di table, beri surrogate key
+    baru, semuanya di sisi server. Kembalikan jumlah baris yang di-insert.
+    Index key di table dibuat terpisah lewat ensure_key_index sebelum transaksi.
+
+    existing_max_id: kalau diisi, hanya baris table dengan id_column <= nilai ini
+    yang dianggap sudah ada (dipakai mode streaming supaya chunk berikutnya tidak
+    tersaring oleh baris yang baru dimuat chunk sebelumnya di run yang sama).
+    """
+    if df.empty:
+        return 0
+
+    key_columns = list(key_columns)
+    columns = [c for c in df.columns if c != id_column]
+    staging = stage_frame(df[columns], table, conn, index_columns=key_columns)
+
+    existing = f"SELECT 1 FROM {table} t WHERE {join_condition('t', 's', key_columns, null_safe=True)}"
+    params = {}
+    if existing_max_id is not None:
+        existing += f" AND t.{id_column} <= :existing_max_id"
+        params['existing_max_id'] = int(existing_max_id)
+    missing = f"FROM {staging} s WHERE NOT EXISTS ({existing})"
+
+    n_new = conn.execute(text(f"SELECT COUNT(*) {missing}"), params).scalar()
+    if not n_new:
+        return 0
+
+    # Satu blok id berurutan untuk semua baris baru, dibagi lewat ROW_NUMBER()
+    _, target_engine = get_engines()
+    start = reserve_block(table, id_column, n_new, target_engine)
+    column_list = ', '.join(columns)
+    result = conn.execute(text(f"""
+        INSERT INTO {table} ({id_column}, {column_list})
+        SELECT :start + ROW_NUMBER() OVER () - 1, {', '.join(f's.{c}' for c in columns)}
+        {missing}
+    """), {**params, 'start': start})
+    return result.rowcount
+
+
+def max_id(table, id_column, conn):
+    """MAX(id_column) saat ini (0 kalau kosong); batas existing_max_id untuk mode streaming."""
+    return int(conn.execute(text(f"SELECT COALESCE(MAX({id_column}), 0) FROM {table}")).scalar())
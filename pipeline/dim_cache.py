@@ -0,0 +1,147 @@
+"""
+Cache lookup dimensi: natural key -> surrogate key.
+
+Loader fakta hanya butuh dua kolom dari dimensi (mis. nrp -> mahasiswa_id),
+bukan SELECT * seluruh tabel lalu merge. Modul ini memuat dua kolom itu sekali
+per proses ke index hash (pandas Index di atas array NumPy) dan menyediakan
+lookup vektor (lookup_ids). Cache dibuang setiap kali tabel dimensinya ditulis
+(bulk_load dan runner memanggil invalidate()).
+
+Opsional: set env DIM_CACHE_DIR supaya index juga disimpan ke file .npz lokal.
+Saat cold start file itu dipakai selama COUNT(*) dan MAX(surrogate key) di
+database masih sama, jadi tidak perlu membaca ulang tabel dari MySQL.
+"""
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from pipeline.db import get_engines
+from pipeline.extract import read_query
+
+# tabel dimensi -> (natural key, surrogate key, jenis key). Hanya dimensi
+# dengan satu surrogate key per natural key. dim_mata_kuliah tidak didaftarkan:
+# tabel itu SCD2 per (kode_mata_kuliah, nama_kelas), jadi satu kode punya banyak
+# mata_kuliah_id, dan loader fakta juga butuh kolom sks dari merge yang sama
+DIMENSIONS = {
+    'dim_mahasiswa': ('nrp', 'mahasiswa_id', 'str'),
+    'dim_waktu': ('tanggal', 'waktu_id', 'date'),
+}
+
+CACHE_DIR_ENV = 'DIM_CACHE_DIR'
+
+_lock = threading.Lock()
+_indexes = {}
+
+
+def _normalize(values, kind):
+    if kind == 'date':
+        # Jam dibuang: dim_waktu per tanggal, caller boleh kirim timestamp mentah
+        return pd.DatetimeIndex(pd.to_datetime(pd.Series(values), errors='coerce')).normalize()
+    return pd.Index(pd.Series(values).astype(str))
+
+
+class DimIndex:
+    """Index hash natural key -> surrogate key untuk satu tabel dimensi."""
+
+    def __init__(self, table, keys, values, fingerprint=None):
+        _, _, kind = DIMENSIONS[table]
+        self.table = table
+        self.kind = kind
+        self.fingerprint = fingerprint
+
+        df = pd.DataFrame({'key': _normalize(keys, kind), 'value': np.asarray(values, dtype=np.int64)})
+        n_dupes = df['key'].duplicated(keep='last').sum()
+        if n_dupes:
+            print(f"[DIM CACHE] ⚠️ {table}: {n_dupes} natural key duplikat, dipakai baris terakhir")
+            df = df.drop_duplicates(subset='key', keep='last')
+
+        self._index = pd.Index(df['key'])
+        self._values = df['value'].to_numpy()
+
+    def __len__(self):
+        return len(self._values)
+
+    def lookup(self, natural_keys):
+        """
+        Kembalikan array surrogate key sepanjang natural_keys.
+        Key yang tidak ada di dimensi jadi NaN (array float), sama seperti hasil left merge.
+        """
+        pos = self._index.get_indexer(_normalize(natural_keys, self.kind))
+        found = pos >= 0
+        if found.all():
+            return self._values[pos]
+        out = np.full(len(pos), np.nan)
+        out[found] = self._values[pos[found]]
+        return out
+
+    def save(self, path):
+        np.savez(
+            path,
+            keys=self._index.to_numpy(dtype='datetime64[ns]' if self.kind == 'date' else str),
+            values=self._values,
+            fingerprint=np.asarray(self.fingerprint, dtype=np.int64),
+        )
+
+
+def _cache_path(table):
+    cache_dir = os.environ.get(CACHE_DIR_ENV)
+    if not cache_dir:
+        return None
+    os.makedirs(cache_dir, exist_ok=True)
+    return os.path.join(cache_dir, f'{table}.npz')
+
+
+def _fingerprint(table, engine):
+    _, surrogate_key, _ = DIMENSIONS[table]
+    df = read_query(f"SELECT COUNT(*) AS n, COALESCE(MAX({surrogate_key}), 0) AS max_id FROM {table}", engine)
+    return int(df['n'][0]), int(df['max_id'][0])
+
+
+def _load_index(table, engine):
+    natural_key, surrogate_key, _ = DIMENSIONS[table]
+    path = _cache_path(table)
+
+    if path and os.path.exists(path):
+        fingerprint = _fingerprint(table, engine)
+        with np.load(path) as data:
+            if tuple(data['fingerprint']) == fingerprint:
+                print(f"[DIM CACHE] {table} dari {path}")
+                return DimIndex(table, data['keys'], data['values'], fingerprint)
+
+    df = read_query(f"SELECT {natural_key}, {surrogate_key} FROM {table}", engine)
+    fingerprint = (len(df), int(df[surrogate_key].max()) if len(df) else 0)
+    index = DimIndex(table, df[natural_key], df[surrogate_key], fingerprint)
+    print(f"[DIM CACHE] {table} → {len(index)} key")
+    if path:
+        index.save(path)
+    return index
+
+
+def get_index(table, engine=None):
+    """DimIndex untuk table, dimuat sekali per proses (atau dari file DIM_CACHE_DIR)."""
+    with _lock:
+        index = _indexes.get(table)
+        if index is None:
+            if engine is None:
+                _, engine = get_engines()
+            index = _load_index(table, engine)
+            _indexes[table] = index
+    return index
+
+
+def lookup_ids(table, natural_keys):
+    """Shortcut: array natural key (mis. nrp) -> array surrogate key (mis. mahasiswa_id)."""
+    return get_index(table).lookup(natural_keys)
+
+
+def invalidate(table):
+    """Buang index table dari memori dan file cache; dipanggil setelah dimensi ditulis."""
+    if table not in DIMENSIONS:
+        return
+    with _lock:
+        _indexes.pop(table, None)
+        path = _cache_path(table)
+        if path and os.path.exists(path):
+            os.remove(path)
@@ -0,0 +1,214 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pandas as pd
+from sqlalchemy import bindparam, text
+
+from pipeline import async_extract, snapshot
+from pipeline.db import EXTRACT_WORKERS
+from pipeline.manifest import apply_dtypes, select_list, table_columns
+
+# Cache hasil extract selama satu run pipeline: (database, tabel) -> Future[DataFrame].
+# None berarti tidak ada run aktif, jadi setiap extract langsung baca ke database.
+_lock = threading.Lock()
+_cache = None
+
+# Thread pool extract bersama per proses; ukurannya membatasi jumlah query
+# extract yang jalan bersamaan walaupun beberapa loader fan-out sekaligus.
+_executor = None
+
+
+def start_run_cache():
+    global _cache
+    with _lock:
+        _cache = {}
+
+
+def clear_run_cache():
+    global _cache
+    with _lock:
+        _cache = None
+
+
+def invalidate(table_name):
+    """Buang tabel dari cache, dipanggil setelah loader menulis ke tabel itu."""
+    with _lock:
+        if _cache is None:
+            return
+        for key in [k for k in _cache if k[1] == table_name]:
+            del _cache[key]
+
+
+def _read_projected(table_name, columns, engine):
+    if snapshot.is_enabled(engine):
+        df = snapshot.read_snapshot(table_name, engine, columns)
+    elif async_extract.is_enabled(engine):
+        df = async_extract.read_sql(f"SELECT {select_list(columns)} FROM {table_name}", engine)
+    else:
+        df = pd.read_sql(f"SELECT {select_list(columns)} FROM {table_name}", engine)
+    return apply_dtypes(df) if columns else df
+
+
+def read_table(table_name, engine, columns=None):
+    """
+    SELECT columns FROM table_name lewat engine (columns=None → SELECT *).
+    Dengan columns (lihat pipeline.manifest), tipe kolom langsung dikonversi saat dibaca.
+    Kalau FRS_SNAPSHOT_DIR di-set, tabel source dibaca dari snapshot Parquet lokal
+    (pipeline.snapshot). Dengan FRS_EXTRACT_BACKEND=async, query dijalankan lewat
+    driver async di satu event loop bersama (pipeline.async_extract).
+
+    Selama run pipeline aktif, setiap tabel hanya dibaca sekali; loader lain
+    (termasuk yang jalan bersamaan) menunggu hasil yang sama lalu dapat salinannya,
+    karena transform di loader sering mengubah DataFrame secara in-place.
+    Yang dibaca adalah gabungan kolom semua loader di manifest, supaya satu
+    query tetap cukup untuk semua loader.
+    """
+    if _cache is None:
+        return _read_projected(table_name, columns, engine)
+
+    if columns:
+        fetch_columns = table_columns(table_name)
+        fetch_columns += [c for c in columns if c not in fetch_columns]
+    else:
+        fetch_columns = None
+
+    key = (engine.url.database, table_name, tuple(fetch_columns or ()))
+    with _lock:
+        future = _cache.get(key)
+        is_owner = future is None
+        if is_owner:
+            future = Future()
+            _cache[key] = future
+
+    if is_owner:
+        try:
+            future.set_result(_read_projected(table_name, fetch_columns, engine))
+        except BaseException as e:
+            future.set_exception(e)
+            with _lock:
+                if _cache is not None and _cache.get(key) is future:
+                    del _cache[key]
+            raise
+
+    df = future.result()
+    return df[list(columns)].copy() if columns else df.copy()
+
+
+def read_query(sql, engine, params=None):
+    """Jalankan query ber-parameter (mis. filter watermark) tanpa cache."""
+    if async_extract.is_enabled(engine):
+        return async_extract.read_sql(text(sql), engine, params=params)
+    return pd.read_sql(text(sql), engine, params=params)
+
+
+def read_latest_per_key(table_name, key_column, order_columns, engine, columns=None, where=None, params=None):
+    """
+    Satu baris per key_column: baris dengan order_columns terbesar (mis. log
+    terakhir per frs_id). Dipilih di source dengan ROW_NUMBER() OVER
+    (PARTITION BY key ORDER BY ... DESC), jadi yang ditransfer hanya satu baris
+    per key dan tidak perlu sort + drop_duplicates di pandas.
+    where/params (opsional) memfilter baris sebelum dipilih, mis. cdc_filter().
+    """
+    order = ', '.join(f"`{c}` DESC" for c in order_columns)
+    inner_columns = f"{select_list(columns)}," if columns else f"{table_name}.*,"
+    sql = f"""
+        SELECT {select_list(columns)} FROM (
+            SELECT {inner_columns}
+                   ROW_NUMBER() OVER (PARTITION BY `{key_column}` ORDER BY {order}) AS _rn
+            FROM {table_name}
+            {f'WHERE {where}' if where else ''}
+        ) latest
+        WHERE _rn = 1
+    """
+    df = read_query(sql, engine, params=params)
+    if not columns:
+        df = df.drop(columns=['_rn'])
+    return apply_dtypes(df) if columns else df
+
+
+def read_table_where_in(table_name, column, keys, engine, chunk_size=1000, columns=None):
+    """
+    SELECT columns FROM table_name WHERE column IN (keys), dipecah per chunk_size
+    supaya daftar IN tidak terlalu panjang. Dipakai loader incremental untuk
+    mengambil baris tabel dependen (frs, detail_frs, ...) hanya untuk key yang terdampak.
+    """
+    keys = pd.Series(keys).dropna().unique().tolist()
+    if not keys:
+        df = pd.read_sql(f"SELECT {select_list(columns)} FROM {table_name} WHERE 1 = 0", engine)
+        return apply_dtypes(df) if columns else df
+
+    query = text(f"SELECT {select_list(columns)} FROM {table_name} WHERE {column} IN :keys") \
+        .bindparams(bindparam('keys', expanding=True))
+    params = [{'keys': keys[i:i + chunk_size]} for i in range(0, len(keys), chunk_size)]
+    if async_extract.is_enabled(engine):
+        # Semua chunk dikirim bersamaan di event loop async
+        chunks = async_extract.read_sql_many([(query, p) for p in params], engine)
+    else:
+        chunks = [pd.read_sql(query, engine, params=p) for p in params]
+    df = pd.concat(chunks, ignore_index=True)
+    return apply_dtypes(df) if columns else df
+
+
+def iter_table_chunks(table_name, key_column, engine, chunk_size, columns=None, after=None):
+    """
+    Baca table_name per chunk dengan keyset pagination:
+    WHERE key_column > :last ORDER BY key_column LIMIT :n, satu query per chunk.
+    Yang ada di memori klien hanya satu chunk, juga dengan driver tanpa
+    server-side cursor (dialect mysqlconnector mengabaikan stream_results dan
+    selalu buffered). key_column harus unik dan ikut di columns.
+    after: mulai setelah key ini (resume dari checkpoint).
+    """
+    last = after
+    while True:
+        where = f"WHERE `{key_column}` > :last" if last is not None else ""
+        sql = f"SELECT {select_list(columns)} FROM {table_name} {where} ORDER BY `{key_column}` LIMIT :n"
+        chunk = read_query(sql, engine, params={'last': last, 'n': chunk_size})
+        if chunk.empty:
+            return
+        if columns:
+            chunk = apply_dtypes(chunk)
+        yield chunk
+        if len(chunk) < chunk_size:
+            return
+        last = chunk[key_column].iloc[-1]
+        last = last.item() if hasattr(last, 'item') else last
+
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=EXTRACT_WORKERS, thread_name_prefix='extract')
+    return _executor
+
+
+def _timed(name, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    rows = f"{len(result)} baris, " if hasattr(result, '__len__') else ""
+    print(f"[EXTRACT] {name} selesai ({rows}{elapsed:.2f}s)")
+    return result, elapsed
+
+
+def extract_many(tasks):
+    """
+    Jalankan extract yang saling independen secara paralel di thread pool bersama.
+    tasks: dict nama -> callable tanpa argumen, mis. {'frs': lambda: extract_table('frs')}.
+    Kembalikan dict nama -> hasil. Waktu per tabel dan total dicetak ke log;
+    total wall-clock kira-kira sama dengan tabel paling lambat.
+    """
+    start = time.perf_counter()
+    executor = _get_executor()
+    futures = {name: executor.submit(_timed, name, func) for name, func in tasks.items()}
+
+    results = {}
+    total_serial = 0.0
+    for name, future in futures.items():
+        results[name], elapsed = future.result()
+        total_serial += elapsed
+
+    wall = time.perf_counter() - start
+    print(f"[EXTRACT] {len(tasks)} tabel dalam {wall:.2f}s (serial {total_serial:.2f}s)")
+    return results
@@ -0,0 +1,163 @@
+"""
+Agregat IPK per (nrp, semester) di tabel agg_ipk_semester (database OLAP).
+
+Setiap baris menyimpan SUM/COUNT nilai di semester itu dan kumulatifnya
+sampai semester itu. ipk_terakhir untuk FRS semester s = kumulatif semester
+terakhir sebelum s, jadi loader fakta cukup lookup per (nrp, semester) tanpa
+join nilai_mahasiswa ke setiap baris fakta.
+
+refresh_ipk() menghitung SUM/COUNT per (nrp, semester) di source (GROUP BY),
+membandingkannya dengan isi tabel, lalu hanya menulis ulang mahasiswa yang
+agregatnya berubah (mis. nilai semester baru masuk). Refresh adalah langkah
+tersendiri (agg_ipk_semester di pipeline/runner.py); lookup_ipk hanya membaca.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import inspect, text
+
+from pipeline.bulk_load import bulk_load
+from pipeline.db import get_engines
+from pipeline.extract import read_query
+from pipeline.staging import stage_frame
+from pipeline.upsert import row_fingerprint
+
+IPK_TABLE = 'agg_ipk_semester'
+
+# nrp disimpan sebagai string seperti dim_mahasiswa.nrp dan key lookup_ipk,
+# jadi join ke dim_mahasiswa tidak butuh cast
+NRP_TYPE = 'VARCHAR(20)'
+
+IPK_DDL = f"""
+    CREATE TABLE IF NOT EXISTS {IPK_TABLE} (
+        nrp {NRP_TYPE} NOT NULL,
+        semester INT NOT NULL,
+        nilai_sum DOUBLE NOT NULL,
+        nilai_count INT NOT NULL,
+        kumulatif_sum DOUBLE NOT NULL,
+        kumulatif_count INT NOT NULL,
+        PRIMARY KEY (nrp, semester)
+    )
+"""
+
+SOURCE_SQL = """
+    SELECT nrp, semester, COALESCE(SUM(nilai), 0) AS nilai_sum, COUNT(nilai) AS nilai_count
+    FROM nilai_mahasiswa
+    GROUP BY nrp, semester
+"""
+
+COLUMNS = ['nrp', 'semester', 'nilai_sum', 'nilai_count', 'kumulatif_sum', 'kumulatif_count']
+
+# Isi agg_ipk_semester di memori, diisi oleh refresh atau baca pertama di proses ini
+_lock = threading.Lock()
+_table = None
+
+
+def ensure_ipk_table(engine):
+    with engine.begin() as conn:
+        conn.execute(text(IPK_DDL))
+        # Tabel dari versi sebelumnya masih punya nrp BIGINT
+        data_type = conn.execute(text("""
+            SELECT data_type FROM information_schema.columns
+            WHERE table_schema = DATABASE() AND table_name = :table AND column_name = 'nrp'
+        """), {'table': IPK_TABLE}).scalar()
+        if data_type is not None and data_type.lower() != 'varchar':
+            conn.execute(text(f"ALTER TABLE {IPK_TABLE} MODIFY nrp {NRP_TYPE} NOT NULL"))
+
+
+def _normalize(df):
+    # Nilai tanpa nrp/semester tidak bisa di-lookup dan melanggar PRIMARY KEY
+    df = df[df['nrp'].notna() & df['semester'].notna()].copy()
+    df['nrp'] = df['nrp'].astype(str)
+    df['semester'] = df['semester'].astype('int64')
+    return df
+
+
+def with_cumulative(df):
+    """Tambah kumulatif_sum/kumulatif_count (termasuk semester itu sendiri) per nrp."""
+    df = df.sort_values(['nrp', 'semester']).reset_index(drop=True)
+    cumulative = df.groupby('nrp')[['nilai_sum', 'nilai_count']].cumsum()
+    df['kumulatif_sum'] = cumulative['nilai_sum']
+    df['kumulatif_count'] = cumulative['nilai_count']
+    return df[COLUMNS]
+
+
+def changed_nrps(df_source, df_stored):
+    """nrp yang agregat per semesternya beda antara source dan tabel (termasuk baris baru/hilang)."""
+    keys = ['nrp', 'semester']
+    source = df_source[keys].assign(_fp=row_fingerprint(df_source, ['nilai_sum', 'nilai_count']))
+    stored = df_stored[keys].assign(_fp=row_fingerprint(df_stored, ['nilai_sum', 'nilai_count']))
+    merged = source.merge(stored, on=keys, how='outer', suffixes=('_src', '_tgt'), indicator=True)
+    differs = (merged['_merge'] != 'both') | (merged['_fp_src'] != merged['_fp_tgt'])
+    return merged.loc[differs, 'nrp'].unique()
+
+
+def _refresh(source_engine, target_engine):
+    global _table
+    ensure_ipk_table(target_engine)
+
+    df_source = _normalize(read_query(SOURCE_SQL, source_engine))
+    df_stored = _normalize(read_query(f"SELECT {', '.join(COLUMNS)} FROM {IPK_TABLE}", target_engine))
+    nrps = changed_nrps(df_source, df_stored)
+
+    df_all = with_cumulative(df_source)
+    if len(nrps):
+        df_changed = df_all[df_all['nrp'].isin(nrps)]
+        with target_engine.begin() as conn:
+            staging = stage_frame(pd.DataFrame({'nrp': nrps}), IPK_TABLE, conn, index_columns=['nrp'])
+            conn.execute(text(f"DELETE t FROM {IPK_TABLE} t JOIN {staging} s ON t.nrp = s.nrp"))
+            bulk_load(df_changed, IPK_TABLE, conn)
+
+    print(f"[IPK] {IPK_TABLE}: {len(nrps)} mahasiswa diperbarui dari {df_source['nrp'].nunique()} mahasiswa")
+    _table = df_all
+
+
+def refresh_ipk(source_engine=None, target_engine=None):
+    """Sinkronkan agg_ipk_semester dengan nilai_mahasiswa (hanya mahasiswa yang berubah)."""
+    if source_engine is None or target_engine is None:
+        source_engine, target_engine = get_engines()
+    with _lock:
+        _refresh(source_engine, target_engine)
+
+
+def get_ipk_table():
+    """
+    Isi agg_ipk_semester (nrp sebagai str), dibaca sekali per proses tanpa menulis.
+    Tabel harus sudah diisi refresh_ipk() sebelum loader fakta jalan.
+    """
+    global _table
+    with _lock:
+        if _table is None:
+            _, target_engine = get_engines()
+            if not inspect(target_engine).has_table(IPK_TABLE):
+                raise RuntimeError(f"{IPK_TABLE} belum ada, jalankan refresh_ipk() (step agg_ipk_semester) dulu")
+            df = read_query(f"SELECT {', '.join(COLUMNS)} FROM {IPK_TABLE}", target_engine)
+            _table = _normalize(df).sort_values(['nrp', 'semester']).reset_index(drop=True)
+        return _table
+
+
+def lookup_ipk(nrp, semester):
+    """
+    ipk_terakhir untuk setiap pasangan (nrp, semester): rata-rata semua nilai di
+    semester < semester, dibulatkan 2 desimal; 0.0 jika belum ada nilai.
+    """
+    table = get_ipk_table()
+    left = pd.DataFrame({
+        'nrp': pd.Series(nrp).astype(str).to_numpy(),
+        'semester': pd.to_numeric(pd.Series(semester), errors='coerce').to_numpy(),
+        '_pos': np.arange(len(nrp)),
+    })
+    left = left[left['semester'].notna()].astype({'semester': 'int64'}).sort_values('semester')
+
+    # Kumulatif semester terakhir yang < semester FRS
+    merged = pd.merge_asof(
+        left,
+        table[['nrp', 'semester', 'kumulatif_sum', 'kumulatif_count']].sort_values('semester'),
+        on='semester', by='nrp', allow_exact_matches=False,
+    )
+    ipk = (merged['kumulatif_sum'] / merged['kumulatif_count'].replace(0, np.nan)).round(2)
+
+    out = np.zeros(len(nrp))
+    out[merged['_pos'].to_numpy()] = ipk.fillna(0.0).to_numpy()
+    return out
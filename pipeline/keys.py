@@ -0,0 +1,118 @@
+"""
+Alokasi surrogate key dari tabel etl_sequence (database OLAP).
+
+Setiap tabel target punya satu baris sequence. Baris itu di-seed dulu dari
+MAX(id) lewat INSERT ... ON DUPLICATE KEY, baru kemudian dikunci dengan
+SELECT ... FOR UPDATE untuk mereservasi id. Default-nya hanya n id yang
+direservasi per panggilan, jadi tidak ada id yang terbuang; block_size bisa
+dinaikkan untuk loader yang memanggil allocate berkali-kali dengan n kecil.
+"""
+import threading
+
+import numpy as np
+from sqlalchemy import text
+
+from pipeline.db import get_engines
+
+SEQUENCE_TABLE = 'etl_sequence'
+
+SEQUENCE_DDL = f"""
+    CREATE TABLE IF NOT EXISTS {SEQUENCE_TABLE} (
+        name VARCHAR(64) NOT NULL PRIMARY KEY,
+        next_id BIGINT NOT NULL
+    )
+"""
+
+_seeded = set()
+_seeded_lock = threading.Lock()
+
+
+def ensure_sequence(table, id_column, engine):
+    """
+    Pastikan baris sequence untuk table ada, sekali per proses.
+    Seed dari MAX(id_column) di transaksi sendiri sebelum baris dikunci: dua proses
+    yang seed bersamaan hanya saling menunggu di primary key, tanpa gap lock
+    SELECT ... FOR UPDATE pada baris yang belum ada (sumber deadlock).
+    Baris yang sudah ada tidak diubah.
+    """
+    with _seeded_lock:
+        if table in _seeded:
+            return
+        with engine.begin() as conn:
+            conn.execute(text(SEQUENCE_DDL))
+        with engine.begin() as conn:
+            conn.execute(
+                text(f"""
+                    INSERT INTO {SEQUENCE_TABLE} (name, next_id)
+                    SELECT :name, COALESCE(MAX({id_column}), 0) + 1 FROM {table}
+                    ON DUPLICATE KEY UPDATE next_id = next_id
+                """),
+                {'name': table},
+            )
+        _seeded.add(table)
+
+
+def reserve_block(table, id_column, size, engine):
+    """Reservasi id [start, start + size) untuk table dan kembalikan start."""
+    ensure_sequence(table, id_column, engine)
+    with engine.begin() as conn:
+        start = int(conn.execute(
+            text(f"SELECT next_id FROM {SEQUENCE_TABLE} WHERE name = :name FOR UPDATE"),
+            {'name': table},
+        ).scalar_one())
+        conn.execute(
+            text(f"UPDATE {SEQUENCE_TABLE} SET next_id = :next_id WHERE name = :name"),
+            {'name': table, 'next_id': start + size},
+        )
+    return start
+
+
+class KeyAllocator:
+    """
+    Pembagi id di memori untuk satu tabel; aman dipakai dari banyak thread.
+    block_size=None mereservasi tepat n id per allocate(n); block_size > n
+    mereservasi lebih dan sisanya dipakai allocate berikutnya di proses ini
+    (sisa yang tidak terpakai saat proses selesai jadi celah id).
+    """
+
+    def __init__(self, table, id_column, engine, block_size=None):
+        self.table = table
+        self.id_column = id_column
+        self.engine = engine
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._next = 0
+        self._end = 0
+
+    def allocate(self, n):
+        """Kembalikan array n surrogate key baru (naik, unik antar proses)."""
+        parts = []
+        with self._lock:
+            while n > 0:
+                if self._next >= self._end:
+                    size = max(self.block_size or 0, n)
+                    self._next = reserve_block(self.table, self.id_column, size, self.engine)
+                    self._end = self._next + size
+                take = min(n, self._end - self._next)
+                parts.append(np.arange(self._next, self._next + take, dtype=np.int64))
+                self._next += take
+                n -= take
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+
+_allocators = {}
+_allocators_lock = threading.Lock()
+
+
+def allocate_ids(table, id_column, n, block_size=None):
+    """
+    Shortcut: n surrogate key baru untuk table memakai allocator bersama per proses.
+    block_size hanya dipakai saat allocator tabel itu pertama kali dibuat.
+    """
+    with _allocators_lock:
+        allocator = _allocators.get(table)
+        if allocator is None:
+            _, target_engine = get_engines()
+            allocator = KeyAllocator(table, id_column, target_engine, block_size)
+            _allocators[table] = allocator
+    return allocator.allocate(n)
@@ -0,0 +1,153 @@
+"""
+Manifest kolom per loader: tabel apa yang dibaca dan kolom mana yang dipakai.
+
+Extract memakai manifest ini untuk membuat query terproyeksi (SELECT kolom,
+bukan SELECT *) dan langsung menerapkan kebijakan tipe saat dibaca, jadi
+transform tidak perlu lagi astype(str) / to_datetime berulang dan DataFrame
+di memori tetap ringkas:
+- nrp sebagai string (key join ke dim_mahasiswa);
+- string berkardinalitas rendah (action, status, ...) sebagai category;
+- id / foreign key sebagai Int32 nullable (Int64 kalau nilainya tidak muat),
+  jadi left merge yang menghasilkan NULL tidak lagi mengubahnya jadi float64;
+- tanggal sebagai datetime64.
+
+Nama kolom di source konsisten antar tabel (nrp, semester, tanggal*), jadi
+tipe didefinisikan per nama kolom, bukan per tabel.
+"""
+import numpy as np
+import pandas as pd
+
+# Tipe kolom setelah dibaca. 'str': teks, 'category': string berkardinalitas rendah,
+# 'datetime': datetime64[ns]; nilai yang gagal di-parse atau di luar MIN_DATE..MAX_DATE → NaT,
+# 'Int16'/'Int32': integer nullable (naik ke Int64 kalau nilai tidak muat)
+COLUMN_DTYPES = {
+    'nrp': 'str',
+    'action': 'category',
+    'status': 'category',
+    'nama_kelas': 'category',
+    'kode_mata_kuliah': 'category',
+    'id': 'Int32',
+    'frs_id': 'Int32',
+    'kelas_id': 'Int32',
+    'jurusan_id': 'Int32',
+    'dosen_wali_id': 'Int32',
+    'mahasiswa_id': 'Int32',
+    'mata_kuliah_id': 'Int32',
+    'status_perubahan_kelas_id': 'Int32',
+    'kapasitas': 'Int32',
+    'semester': 'Int16',
+    'sks': 'Int16',
+    'tanggal': 'datetime',
+    'tanggal_disetujui': 'datetime',
+    'tanggal_pengajuan': 'datetime',
+    'tanggal_bayar': 'datetime',
+}
+
+# Jangkauan datetime64[ns]. errors='coerce' saja tidak cukup: pandas 3 mem-parse
+# tanggal sentinel (9999-12-31, 0001-01-01) dengan resolusi lain tanpa NaT
+MIN_DATE = pd.Timestamp(1677, 9, 22)
+MAX_DATE = pd.Timestamp(2262, 4, 11)
+
+# loader -> tabel -> kolom yang dibaca. Nama loader = nama tabel OLAP yang ditulis.
+MANIFEST = {
+    'dim_dosen_wali': {
+        'dosen_wali': ['nama', 'email'],
+        'dim_dosen_wali': ['nama', 'email'],
+    },
+    'dim_mahasiswa': {
+        'mahasiswa': ['nrp', 'nama', 'email', 'jurusan_id', 'dosen_wali_id'],
+        'jurusan': ['jurusan_id', 'nama_jurusan'],
+        'dosen_wali': ['id', 'nama'],
+        'dim_mahasiswa': ['nrp', 'nama', 'email', 'nama_jurusan', 'nama_dosen_wali'],
+    },
+    'dim_mata_kuliah': {
+        'mata_kuliah': ['kode_mata_kuliah', 'nama', 'sks'],
+        'kelas': ['kode_mata_kuliah', 'nama_kelas', 'dosen', 'kapasitas'],
+    },
+    'dim_status': {
+        'log_frs': ['status'],
+    },
+    'dim_status_perubahan_kelas': {
+        'detail_frs': ['action'],
+    },
+    'fact_persetujuan_frs': {
+        'frs': ['id', 'nrp'],
+        'mahasiswa': ['nrp', 'dosen_wali_id'],
+        'log_frs': ['id', 'frs_id', 'status', 'tanggal'],
+        'detail_frs': ['frs_id', 'kelas_id', 'action'],
+        'kelas': ['id', 'kode_mata_kuliah'],
+        'dim_mata_kuliah': ['kode_mata_kuliah', 'sks'],
+    },
+    'fact_pembatalan_frs': {
+        'pembatalan_frs': ['id', 'frs_id', 'tanggal_pengajuan'],
+        'frs': ['id', 'nrp', 'tanggal_disetujui', 'semester'],
+    },
+    'fact_pengambilan_kelas': {
+        'detail_frs': ['frs_id', 'kelas_id', 'action'],
+        'frs': ['id', 'nrp', 'semester', 'tanggal_disetujui'],
+        'kelas': ['id', 'kode_mata_kuliah'],
+        'pembayaran': ['nrp', 'semester'],
+        'dim_mata_kuliah': ['kode_mata_kuliah', 'mata_kuliah_id', 'sks'],
+    },
+    'fact_perubahan_kelas': {
+        # id: watermark (tanggal, id) dan urutan baris pertama grup di mode delta
+        'detail_frs': ['id', 'frs_id', 'kelas_id', 'action', 'tanggal'],
+        'kelas': ['id', 'kode_mata_kuliah'],
+        'frs': ['id', 'nrp', 'semester'],
+        'dim_mata_kuliah': ['kode_mata_kuliah', 'mata_kuliah_id', 'sks'],
+        'dim_status_perubahan_kelas': ['status_perubahan_kelas_id', 'status'],
+    },
+}
+
+
+def columns_for(loader, table):
+    """Kolom table yang dipakai loader (KeyError kalau belum ada di manifest)."""
+    return list(MANIFEST[loader][table])
+
+
+def table_columns(table):
+    """Gabungan kolom table dari semua loader, urut kemunculan pertama."""
+    columns = []
+    for tables in MANIFEST.values():
+        for col in tables.get(table, []):
+            if col not in columns:
+                columns.append(col)
+    return columns
+
+
+def select_list(columns):
+    """Daftar kolom untuk klausa SELECT; None berarti semua kolom."""
+    if not columns:
+        return '*'
+    return ', '.join(f'`{c}`' for c in columns)
+
+
+def _compact_int(values, dtype):
+    """Integer nullable sekecil dtype; Int64 kalau ada nilai di luar jangkauannya."""
+    values = pd.to_numeric(values, errors='coerce')
+    info = np.iinfo(dtype.lower())
+    if values.notna().any() and (values.min() < info.min or values.max() > info.max):
+        return values.astype('Int64')
+    return values.astype(dtype)
+
+
+def to_datetime_ns(values):
+    """Series datetime64[ns]; nilai kosong, tidak valid atau di luar MIN_DATE..MAX_DATE jadi NaT."""
+    dates = pd.to_datetime(pd.Series(values), errors='coerce')
+    return dates.where((dates >= MIN_DATE) & (dates <= MAX_DATE)).astype('datetime64[ns]')
+
+
+def apply_dtypes(df):
+    """Terapkan COLUMN_DTYPES ke kolom yang ada di df (in-place), kembalikan df."""
+    for col, dtype in COLUMN_DTYPES.items():
+        if col not in df.columns:
+            continue
+        if dtype == 'datetime':
+            df[col] = to_datetime_ns(df[col])
+        elif dtype == 'str':
+            df[col] = df[col].astype(str)
+        elif dtype == 'category':
+            df[col] = df[col].astype('category')
+        else:
+            df[col] = _compact_int(df[col], dtype)
+    return df
@@ -0,0 +1,196 @@
+"""
+Instrumentasi per step extract / transform / load untuk semua loader.
+
+Fungsi loader dibungkus dengan decorator @step('extract' | 'transform' | 'load').
+Setiap panggilan menghasilkan satu record:
+
+    {"ts", "mode", "loader", "phase", "step", "seconds", "rows_in", "rows_out",
+     "bytes", "rss_mb", "peak_rss_mb", "status"}
+
+- rows_in  : jumlah baris DataFrame di argumen (load: df yang dimuat)
+- rows_out : jumlah baris hasil (load: nilai kembali kalau int, selain itu rows_in)
+- bytes    : ukuran DataFrame hasil extract / yang dimuat (memory_usage shallow,
+             isi string tidak dihitung supaya murah)
+- rss_mb / peak_rss_mb : RSS proses saat step selesai dan puncaknya sejauh ini
+
+Record ditulis sebagai JSON lines ke FRS_METRICS_FILE (append), atau dicetak
+dengan prefix [METRICS] kalau env itu tidak di-set. Kalau FRS_METRICS_PROM
+di-set, nilai terakhir per step juga ditulis ulang ke file teks format
+Prometheus (untuk textfile collector node_exporter).
+
+Log debug yang mahal (unique/nunique seluruh kolom hanya untuk dicetak) dijaga
+dengan is_debug(), aktif kalau FRS_LOG_LEVEL=DEBUG.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# === CONFIGURATION ===
+LOG_LEVEL = os.environ.get('FRS_LOG_LEVEL', 'INFO').upper()
+METRICS_FILE = os.environ.get('FRS_METRICS_FILE')
+PROM_FILE = os.environ.get('FRS_METRICS_PROM')
+
+PHASES = ('extract', 'transform', 'load')
+
+_lock = threading.Lock()
+# (mode, loader, phase, step) -> record terakhir, untuk file Prometheus
+_latest = {}
+
+
+def is_debug():
+    """True kalau FRS_LOG_LEVEL=DEBUG; dipakai untuk menjaga print [DEBUG] yang mahal."""
+    return LOG_LEVEL == 'DEBUG'
+
+
+def sample_dates(values, n=5):
+    """n tanggal unik pertama sebagai 'YYYY-MM-DD'; strftime hanya pada sampel, bukan seluruh kolom."""
+    return values.drop_duplicates().head(n).dt.strftime('%Y-%m-%d').to_numpy()
+
+
+# === MEMORI & UKURAN ===
+def _rss_mb():
+    """RSS proses saat ini dalam MB (Linux /proc), None kalau tidak tersedia."""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return round(pages * os.sysconf('SC_PAGE_SIZE') / 2**20, 1)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    # ru_maxrss dalam KB di Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def _frames(value):
+    if isinstance(value, pd.DataFrame):
+        return [value]
+    if isinstance(value, dict):
+        return [v for v in value.values() if isinstance(v, pd.DataFrame)]
+    if isinstance(value, (list, tuple)):
+        return [v for v in value if isinstance(v, pd.DataFrame)]
+    return []
+
+
+def _rows(frames):
+    return sum(len(df) for df in frames)
+
+
+def _bytes(frames):
+    return int(sum(df.memory_usage(index=True).sum() for df in frames))
+
+
+def _loader_of(func):
+    """(mode, loader) dari lokasi file fungsi, mis. one_time_incremental/fact_x.py."""
+    path = func.__code__.co_filename
+    loader = os.path.splitext(os.path.basename(path))[0]
+    mode = os.path.basename(os.path.dirname(path)).replace('one_time_', '')
+    return mode, loader
+
+
+# === DECORATOR ===
+def step(phase):
+    """Decorator: catat waktu, baris, bytes dan memori setiap panggilan fungsi."""
+    if phase not in PHASES:
+        raise ValueError(f"phase tidak dikenal: {phase}")
+
+    def decorator(func):
+        mode, loader = _loader_of(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            frames_in = _frames(args) + _frames(kwargs)
+            start = time.perf_counter()
+            status = 'ok'
+            result = None
+            try:
+                result = func(*args, **kwargs)
+                return result
+            except BaseException:
+                status = 'failed'
+                raise
+            finally:
+                elapsed = time.perf_counter() - start
+                frames_out = _frames(result)
+                rows_in = _rows(frames_in)
+                if phase == 'load':
+                    rows_out = result if isinstance(result, int) and not isinstance(result, bool) else rows_in
+                    size = _bytes(frames_in)
+                else:
+                    rows_out = _rows(frames_out)
+                    size = _bytes(frames_out) if phase == 'extract' else None
+                emit({
+                    'ts': datetime.now().isoformat(timespec='seconds'),
+                    'mode': mode,
+                    'loader': loader,
+                    'phase': phase,
+                    'step': func.__name__,
+                    'seconds': round(elapsed, 4),
+                    'rows_in': rows_in,
+                    'rows_out': rows_out,
+                    'bytes': size,
+                    'rss_mb': _rss_mb(),
+                    'peak_rss_mb': _peak_rss_mb(),
+                    'status': status,
+                })
+        return wrapper
+    return decorator
+
+
+# === OUTPUT ===
+def emit(record):
+    """Tulis satu record sebagai JSON line dan perbarui file Prometheus (kalau aktif)."""
+    line = json.dumps(record, default=str)
+    with _lock:
+        if METRICS_FILE:
+            with open(METRICS_FILE, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+        else:
+            print(f"[METRICS] {line}")
+        if PROM_FILE:
+            _latest[(record['mode'], record['loader'], record['phase'], record['step'])] = record
+            _write_prometheus(PROM_FILE)
+
+
+PROM_METRICS = [
+    ('frs_etl_step_seconds', 'seconds', 'Durasi step ETL terakhir (detik)'),
+    ('frs_etl_step_rows_in', 'rows_in', 'Baris masuk step ETL terakhir'),
+    ('frs_etl_step_rows_out', 'rows_out', 'Baris keluar step ETL terakhir'),
+    ('frs_etl_step_bytes', 'bytes', 'Ukuran DataFrame step ETL terakhir (bytes, shallow)'),
+    ('frs_etl_step_peak_rss_mb', 'peak_rss_mb', 'Peak RSS proses setelah step ETL terakhir (MB)'),
+    ('frs_etl_step_failed', 'status', 'Step ETL terakhir gagal (1) atau berhasil (0)'),
+]
+
+
+def _write_prometheus(path):
+    lines = []
+    for metric, field, help_text in PROM_METRICS:
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} gauge")
+        for (mode, loader, phase, step_name), record in sorted(_latest.items()):
+            value = record[field]
+            if field == 'status':
+                value = int(value != 'ok')
+            if value is None:
+                continue
+            labels = f'mode="{mode}",loader="{loader}",phase="{phase}",step="{step_name}"'
+            lines.append(f"{metric}{{{labels}}} {value}")
+
+    # Tulis ke file sementara lalu rename, supaya collector tidak membaca file setengah jadi
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+    os.replace(tmp, path)
@@ -0,0 +1,85 @@
+"""
+Publish hasil loader fakta secara atomik lewat staging table.
+
+Sebelumnya loader menulis langsung ke tabel fakta (to_sql / LOAD DATA), jadi
+kalau proses mati di tengah jalan, baris setengah jadi sudah terlihat pembaca
+dan watermark berbasis MAX(id) melompati sisanya. Sekarang:
+
+- publish_append (incremental): df ditulis dulu ke TEMPORARY TABLE milik run
+  ini, lalu dipindah dengan satu INSERT ... SELECT di transaksi loader (yang
+  sama dengan update etl_state). Lock baris fakta hanya dipegang selama
+  statement itu, bukan selama bulk load dari pandas.
+- publish_swap (historical full load): df dimuat ke <table>__new yang dibuat
+  LIKE tabel asli, lalu RENAME TABLE menukar keduanya dalam satu operasi
+  atomik. Pembaca selalu melihat versi lama yang utuh atau versi baru yang
+  utuh, dan run ulang menghasilkan isi yang sama (idempotent), bukan duplikat.
+
+publish_swap(..., loader=..., watermarks=...) juga menyelaraskan etl_state:
+state loader dihapus sebelum swap dan watermark dari data yang dimuat ditulis
+setelahnya. RENAME TABLE adalah DDL (implicit commit), jadi tidak bisa satu
+transaksi dengan etl_state; kalau proses mati di antaranya, state sudah kosong
+dan loader incremental kembali menghitung watermark dari tabel fakta, bukan
+memakai watermark lama yang akan memuat ulang (duplikat) semua baris setelahnya.
+
+Catatan: CREATE TABLE ... LIKE menyalin kolom dan index, tetapi tidak foreign
+key. Tabel fakta yang dipublish lewat publish_swap tidak boleh bergantung pada
+FK constraint.
+"""
+from sqlalchemy import text
+
+from pipeline import dim_cache
+from pipeline.bulk_load import bulk_load
+from pipeline.staging import stage_frame
+from pipeline.state import ensure_state_table, reset_loader_state, set_watermark
+
+
+def publish_append(df, table, conn):
+    """
+    Append df ke table lewat staging table di koneksi conn (harus di dalam
+    transaksi, mis. dari engine.begin()). Kembalikan jumlah baris.
+    """
+    if df.empty:
+        return 0
+
+    staging = stage_frame(df, table, conn)
+    columns = ', '.join(f'`{c}`' for c in df.columns)
+    conn.execute(text(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {staging}"))
+    dim_cache.invalidate(table)
+    print(f"[PUBLISH] {table} ← {len(df)} baris dari {staging}")
+    return len(df)
+
+
+def publish_swap(df, table, engine, loader=None, watermarks=None):
+    """
+    Ganti seluruh isi table dengan df: load ke <table>__new lalu RENAME swap.
+    Kalau load gagal, table tidak tersentuh dan <table>__new dibuang di run berikutnya.
+
+    loader: state etl_state loader ini di-reset, lalu watermarks
+    (source_table -> watermark, lihat pipeline.state) disimpan setelah swap.
+    """
+    new, old = f"{table}__new", f"{table}__old"
+    if loader is not None:
+        ensure_state_table(engine)
+        with engine.begin() as conn:
+            reset_loader_state(conn, loader)
+
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {new}"))
+        conn.execute(text(f"DROP TABLE IF EXISTS {old}"))
+        conn.execute(text(f"CREATE TABLE {new} LIKE {table}"))
+
+    bulk_load(df, new, engine)
+
+    with engine.begin() as conn:
+        # Satu statement RENAME untuk kedua tabel: atomik bagi pembaca
+        conn.execute(text(f"RENAME TABLE {table} TO {old}, {new} TO {table}"))
+        conn.execute(text(f"DROP TABLE {old}"))
+
+    if loader is not None:
+        with engine.begin() as conn:
+            for source_table, watermark in (watermarks or {}).items():
+                if watermark is not None:
+                    set_watermark(conn, loader, source_table, watermark, rows_loaded=len(df))
+    dim_cache.invalidate(table)
+    print(f"[PUBLISH] {table} ← {len(df)} baris (swap dari {new})")
+    return len(df)
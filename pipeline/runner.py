@@ -0,0 +1,213 @@
+"""
+Runner DAG untuk semua loader ETL dalam satu proses.
+
+Contoh (dari root repo):
+    python -m pipeline.runner --mode historical
+    python -m pipeline.runner --mode incremental --workers 4
+
+Semua loader memakai satu pasang engine (pipeline.db) dan cache extract
+(pipeline.extract), jadi setiap tabel source cukup dibaca sekali per run.
+Node yang dependensinya sudah selesai dijalankan bersamaan.
+"""
+import argparse
+import importlib
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from pipeline import dim_cache, extract
+from pipeline.db import get_engines
+
+# === DAG ===
+# nama node = tabel OLAP yang ditulis loader tersebut
+# (agg_ipk_semester: agregat IPK bantu untuk fakta, lihat pipeline/ipk.py)
+HISTORICAL_NODES = {
+    'dim_waktu': {'module': 'one_time_historical.dim_waktu', 'entry': 'run_etl_waktu', 'deps': []},
+    'dim_status': {'module': 'one_time_historical.dim_status', 'entry': 'run_etl_status', 'deps': []},
+    'dim_status_perubahan_kelas': {
+        'module': 'one_time_historical.dim_status_perubahan_kelas',
+        'entry': 'run_etl_status_perubahan_kelas',
+        'deps': [],
+    },
+    'dim_dosen_wali': {'module': 'one_time_historical.dim_dosen_wali', 'entry': 'run_etl_dosen_wali', 'deps': []},
+    'dim_mahasiswa': {'module': 'one_time_historical.dim_mahasiswa', 'entry': 'run_etl_mahasiswa', 'deps': []},
+    'dim_mata_kuliah': {'module': 'one_time_historical.dim_mata_kuliah', 'entry': 'run_etl_dim_mk', 'deps': []},
+    'agg_ipk_semester': {'module': 'pipeline.ipk', 'entry': 'refresh_ipk', 'deps': []},
+    'fact_persetujuan_frs': {
+        'module': 'one_time_historical.fact_persetujuan_frs',
+        'entry': 'run_etl',
+        'deps': ['dim_waktu', 'dim_status', 'dim_mahasiswa', 'dim_mata_kuliah'],
+    },
+    'fact_pembatalan_frs': {
+        'module': 'one_time_historical.fact_pembatalan_frs',
+        'entry': 'run_etl',
+        'deps': ['dim_waktu', 'dim_mahasiswa', 'agg_ipk_semester'],
+    },
+    'fact_pengambilan_kelas': {
+        'module': 'one_time_historical.fact_pengambilan_kelas',
+        'entry': 'run_etl_fact_pengambilan_kelas',
+        'deps': ['dim_waktu', 'dim_mahasiswa', 'dim_mata_kuliah', 'agg_ipk_semester'],
+    },
+    'fact_perubahan_kelas': {
+        'module': 'one_time_historical.fact_perubahan_kelas',
+        'entry': 'run_etl_fact_perubahan_kelas',
+        'deps': ['dim_waktu', 'dim_mahasiswa', 'dim_mata_kuliah', 'dim_status_perubahan_kelas'],
+    },
+}
+
+INCREMENTAL_NODES = {
+    'dim_waktu': {'module': 'one_time_incremental.dim_waktu', 'entry': 'run_incremental_etl_waktu', 'deps': []},
+    'dim_dosen_wali': {'module': 'one_time_incremental.dim_dosen_wali', 'entry': 'run_incremental_etl', 'deps': []},
+    'dim_mahasiswa': {'module': 'one_time_incremental.dim_mahasiswa', 'entry': 'compare_and_update', 'deps': []},
+    'dim_mata_kuliah': {'module': 'one_time_incremental.dim_mata_kuliah', 'entry': 'run_incremental_dim_mk', 'deps': []},
+    'agg_ipk_semester': {'module': 'pipeline.ipk', 'entry': 'refresh_ipk', 'deps': []},
+    'fact_persetujuan_frs': {
+        'module': 'one_time_incremental.fact_persetujuan_frs',
+        'entry': 'run_etl_incremental',
+        'deps': ['dim_waktu', 'dim_mahasiswa', 'dim_mata_kuliah'],
+    },
+    'fact_pembatalan_frs': {
+        'module': 'one_time_incremental.fact_pembatalan_frs',
+        'entry': 'run_etl_incremental',
+        'deps': ['dim_waktu', 'dim_mahasiswa', 'agg_ipk_semester'],
+    },
+    'fact_pengambilan_kelas': {
+        'module': 'one_time_incremental.fact_pengambilan_kelas',
+        'entry': 'run_etl_incremental',
+        'deps': ['dim_waktu', 'dim_mahasiswa', 'dim_mata_kuliah', 'agg_ipk_semester'],
+    },
+    'fact_perubahan_kelas': {
+        'module': 'one_time_incremental.fact_perubahan_kelas',
+        'entry': 'run_etl_incremental',
+        'deps': ['dim_waktu', 'dim_mahasiswa', 'dim_mata_kuliah'],
+    },
+}
+
+DAGS = {
+    'historical': HISTORICAL_NODES,
+    'incremental': INCREMENTAL_NODES,
+}
+
+
+def select_nodes(nodes, only=None):
+    """Ambil node yang diminta beserta semua dependensinya."""
+    if not only:
+        return dict(nodes)
+
+    selected = {}
+    stack = list(only)
+    while stack:
+        name = stack.pop()
+        if name in selected:
+            continue
+        if name not in nodes:
+            raise ValueError(f"Node tidak dikenal: {name}")
+        selected[name] = nodes[name]
+        stack.extend(nodes[name]['deps'])
+    return selected
+
+
+def validate_dag(nodes):
+    """Pastikan semua dependensi ada dan tidak ada siklus."""
+    for name, spec in nodes.items():
+        for dep in spec['deps']:
+            if dep not in nodes:
+                raise ValueError(f"{name} bergantung pada node yang tidak ada: {dep}")
+
+    visited, in_progress = set(), set()
+
+    def visit(name):
+        if name in visited:
+            return
+        if name in in_progress:
+            raise ValueError(f"Siklus dependensi terdeteksi di {name}")
+        in_progress.add(name)
+        for dep in nodes[name]['deps']:
+            visit(dep)
+        in_progress.discard(name)
+        visited.add(name)
+
+    for name in nodes:
+        visit(name)
+
+
+def run_node(name, entry):
+    print(f"[RUNNER] ▶ {name}")
+    start = time.perf_counter()
+    entry()
+    print(f"[RUNNER] ✔ {name} ({time.perf_counter() - start:.1f}s)")
+
+
+def run_dag(nodes, max_workers=4):
+    """
+    Jalankan semua node sesuai urutan dependensi.
+    Node yang gagal tidak menghentikan cabang lain, tapi semua node yang
+    bergantung padanya di-skip. Kembalikan dict nama -> 'ok'/'failed'/'skipped'.
+    """
+    validate_dag(nodes)
+
+    # Buat engine (dan minta password) sekali sebelum modul loader di-import
+    get_engines()
+    entries = {
+        name: getattr(importlib.import_module(spec['module']), spec['entry'])
+        for name, spec in nodes.items()
+    }
+
+    status = {}
+    pending = dict(nodes)
+    running = {}
+
+    extract.start_run_cache()
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            while pending or running:
+                for name, spec in list(pending.items()):
+                    dep_status = [status.get(dep) for dep in spec['deps']]
+                    if any(s in ('failed', 'skipped') for s in dep_status):
+                        print(f"[RUNNER] ⏭ {name} di-skip karena dependensi gagal")
+                        status[name] = 'skipped'
+                        del pending[name]
+                    elif all(s == 'ok' for s in dep_status):
+                        running[pool.submit(run_node, name, entries[name])] = name
+                        del pending[name]
+
+                if not running:
+                    continue
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    # Tabel yang baru ditulis harus dibaca ulang oleh node berikutnya
+                    extract.invalidate(name)
+                    dim_cache.invalidate(name)
+                    try:
+                        future.result()
+                        status[name] = 'ok'
+                    except Exception as e:
+                        print(f"[RUNNER] ❌ {name} gagal: {e}")
+                        status[name] = 'failed'
+    finally:
+        extract.clear_run_cache()
+
+    return status
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Jalankan semua loader ETL sebagai satu DAG.")
+    parser.add_argument('--mode', choices=sorted(DAGS), default='incremental')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--only', nargs='*', help="Jalankan node ini saja (beserta dependensinya)")
+    args = parser.parse_args()
+
+    nodes = select_nodes(DAGS[args.mode], args.only)
+    status = run_dag(nodes, max_workers=args.workers)
+
+    print("\n=== RINGKASAN ===")
+    for name in nodes:
+        print(f" - {name}: {status.get(name)}")
+
+    if any(s != 'ok' for s in status.values()):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+SCD Type 2 merge set-based untuk tabel dimensi.
+
+Konfigurasi per dimensi: natural key dan kolom yang dilacak. Baris Current di
+target dibandingkan dengan baris masuk lewat fingerprint (hash kolom yang
+dilacak); semua versi lama yang berubah di-expire dengan satu UPDATE ... JOIN
+ke staging table, lalu versi baru dimasukkan sekaligus lewat bulk_load.
+Expire dan insert berjalan dalam satu transaksi.
+"""
+from datetime import date, datetime
+
+import pandas as pd
+from sqlalchemy import text
+
+from pipeline.bulk_load import bulk_load
+from pipeline.keys import allocate_ids
+from pipeline.staging import join_condition, stage_frame
+from pipeline.upsert import row_fingerprint
+
+EFFECTIVE_COLUMN = 'row_effective_date'
+EXPIRATION_COLUMN = 'row_expiration_date'
+FLAG_COLUMN = 'current_row_flag'
+CURRENT = 'Current'
+EXPIRED = 'Expired'
+MAX_DATE = datetime.max.date()
+
+
+def read_current(table, natural_keys, tracked_columns, engine):
+    """Baris Current di target, hanya kolom natural key + kolom yang dilacak."""
+    columns = ', '.join(list(natural_keys) + list(tracked_columns))
+    return pd.read_sql(
+        text(f"SELECT {columns} FROM {table} WHERE {FLAG_COLUMN} = :flag"),
+        engine, params={'flag': CURRENT},
+    )
+
+
+def diff_scd2(df_current, df_new, natural_keys, tracked_columns):
+    """
+    Bandingkan versi Current dengan baris masuk.
+    Kembalikan (changed_keys, to_insert): natural key yang harus di-expire dan
+    baris df_new untuk key baru atau key yang berubah.
+    """
+    natural_keys = list(natural_keys)
+    current = df_current[natural_keys].copy()
+    current['_fp'] = row_fingerprint(df_current, tracked_columns)
+
+    incoming = df_new.drop_duplicates(subset=natural_keys + list(tracked_columns)).copy()
+    incoming['_fp'] = row_fingerprint(incoming, tracked_columns)
+
+    merged = incoming.merge(current, on=natural_keys, how='left', suffixes=('', '_current'), indicator=True)
+    is_new = (merged['_merge'] == 'left_only').to_numpy()
+    is_changed = (merged['_merge'] == 'both').to_numpy() & (merged['_fp'] != merged['_fp_current']).to_numpy()
+
+    changed_keys = merged.loc[is_changed, natural_keys].drop_duplicates()
+    # Semua baris masuk untuk key yang berubah ikut jadi versi baru
+    changed_index = pd.MultiIndex.from_frame(changed_keys)
+    incoming_index = pd.MultiIndex.from_frame(incoming[natural_keys])
+    new_index = pd.MultiIndex.from_frame(merged.loc[is_new, natural_keys])
+    to_insert = incoming[incoming_index.isin(changed_index) | incoming_index.isin(new_index)]
+
+    return changed_keys, to_insert.drop(columns=['_fp'])
+
+
+def scd2_merge(df_new, table, id_column, natural_keys, tracked_columns, engine, as_of=None):
+    """
+    Terapkan SCD2 untuk df_new ke table. Kembalikan dict jumlah baris
+    {'expired': ..., 'inserted': ...}. as_of: tanggal berlaku (default hari ini).
+    """
+    as_of = as_of or date.today()
+    natural_keys = list(natural_keys)
+
+    df_current = read_current(table, natural_keys, tracked_columns, engine)
+    changed_keys, to_insert = diff_scd2(df_current, df_new, natural_keys, tracked_columns)
+    print(f"[SCD2] {table}: {len(changed_keys)} key berubah, "
+          f"{len(to_insert)} versi baru dari {len(df_new)} baris masuk")
+
+    to_insert = to_insert.copy()
+    to_insert[EFFECTIVE_COLUMN] = pd.Timestamp(as_of)
+    to_insert[EXPIRATION_COLUMN] = pd.Timestamp(MAX_DATE)
+    to_insert[FLAG_COLUMN] = CURRENT
+    to_insert.insert(0, id_column, allocate_ids(table, id_column, len(to_insert)))
+
+    expired = 0
+    with engine.begin() as conn:
+        if not changed_keys.empty:
+            staging = stage_frame(changed_keys, table, conn, index_columns=natural_keys)
+            result = conn.execute(
+                text(f"""
+                    UPDATE {table} t
+                    JOIN {staging} s ON {join_condition('t', 's', natural_keys)}
+                    SET t.{EXPIRATION_COLUMN} = :expire_date, t.{FLAG_COLUMN} = :expired
+                    WHERE t.{FLAG_COLUMN} = :current
+                """),
+                {'expire_date': as_of, 'expired': EXPIRED, 'current': CURRENT},
+            )
+            expired = result.rowcount
+        bulk_load(to_insert, table, conn)
+
+    return {'expired': expired, 'inserted': len(to_insert)}
@@ -0,0 +1,264 @@
+"""
+Snapshot lokal (Parquet) untuk tabel source OLTP.
+
+Opsional: set env FRS_SNAPSHOT_DIR supaya read_table() ke database source
+dilayani dari file Parquet lokal, bukan SELECT ke frs_paling_fix setiap run.
+Berguna saat menjalankan ulang satu loader untuk debugging atau backfill.
+
+Per tabel disimpan satu direktori berisi part-NNNNN.parquet + _meta.json
+(daftar part, jumlah baris, dan penanda kesegaran). Setiap baca dicek ke source:
+
+- Tabel dengan kolom waktu (SNAPSHOT_WATERMARKS) memakai watermark (ts, pk)
+  seperti etl_state (pipeline/state.py): baris dengan (ts, pk) > watermark
+  diambil sebagai delta. pk yang belum ada ditambahkan sebagai part baru; pk
+  yang sudah ada (UPDATE di tempat yang mengubah kolom waktu, mis. FRS yang
+  baru disetujui) menggantikan versi lamanya. Kalau COUNT(*) tidak cocok
+  setelahnya (baris dihapus, ts NULL), snapshot dibuat ulang penuh.
+- Tabel lain (dimensi kecil: mahasiswa, kelas, ...) dicek dengan COUNT(*),
+  MAX(key) dan, di MySQL, CHECKSUM TABLE, jadi UPDATE di tempat juga
+  terdeteksi; kalau berbeda, snapshot dibuat ulang penuh.
+
+UPDATE yang tidak mengubah kolom waktu di tabel ber-watermark tidak
+terdeteksi; hapus direktori snapshot untuk data yang harus segar.
+_meta.json ditulis terakhir, jadi proses yang mati di tengah sync
+meninggalkan snapshot lama yang utuh. Butuh pyarrow; kalau tidak terpasang,
+snapshot otomatis nonaktif.
+"""
+import json
+import numbers
+import os
+import threading
+
+import pandas as pd
+from sqlalchemy import text
+
+from pipeline.db import SOURCE_DB
+from pipeline.state import cdc_filter, watermark_from_rows
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pc = pq = None
+
+SNAPSHOT_DIR_ENV = 'FRS_SNAPSHOT_DIR'
+
+# Primary key per tabel; default 'id'
+SNAPSHOT_KEYS = {
+    'mahasiswa': 'nrp',
+    'jurusan': 'jurusan_id',
+    'mata_kuliah': 'kode_mata_kuliah',
+}
+
+# Kolom waktu untuk watermark (ts, pk) per tabel transaksi; tabel lain
+# memakai fingerprint COUNT/MAX/CHECKSUM
+SNAPSHOT_WATERMARKS = {
+    'frs': 'tanggal_disetujui',
+    'pembayaran': 'tanggal_bayar',
+    'detail_frs': 'tanggal',
+    'log_frs': 'tanggal',
+    'pembatalan_frs': 'tanggal_pengajuan',
+}
+
+META_FILE = '_meta.json'
+
+_lock = threading.Lock()
+_table_locks = {}
+_warned = False
+
+
+def snapshot_dir():
+    return os.environ.get(SNAPSHOT_DIR_ENV)
+
+
+def is_enabled(engine):
+    """Snapshot aktif untuk engine source kalau FRS_SNAPSHOT_DIR di-set dan pyarrow ada."""
+    global _warned
+    if not snapshot_dir() or engine.url.database != SOURCE_DB:
+        return False
+    if pq is None:
+        if not _warned:
+            print(f"[SNAPSHOT] ⚠️ {SNAPSHOT_DIR_ENV} di-set tapi pyarrow tidak terpasang, snapshot nonaktif")
+            _warned = True
+        return False
+    return True
+
+
+def _table_lock(table_name):
+    with _lock:
+        return _table_locks.setdefault(table_name, threading.Lock())
+
+
+def _paths(table_name):
+    directory = os.path.join(snapshot_dir(), table_name)
+    return directory, os.path.join(directory, META_FILE)
+
+
+def _read_meta(meta_path):
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path) as f:
+        return json.load(f)
+
+
+def _write_meta(meta_path, meta):
+    tmp = meta_path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(meta, f)
+    os.replace(tmp, meta_path)
+
+
+# === PART ===
+def _write_part(directory, part, table):
+    """Tulis table sebagai part-NNNNN.parquet, kembalikan nama filenya."""
+    name = f'part-{part:05d}.parquet'
+    # Nama berawalan '.' diabaikan pyarrow saat membaca direktori
+    tmp = os.path.join(directory, f'.part-{part:05d}.tmp')
+    pq.write_table(table, tmp)
+    os.replace(tmp, os.path.join(directory, name))
+    return name
+
+
+def _remove_unlisted(directory, files):
+    """Buang part yang tidak lagi tercatat di _meta.json (sisa rewrite / run yang mati)."""
+    for name in os.listdir(directory):
+        if name.startswith('part-') and name not in files:
+            os.remove(os.path.join(directory, name))
+
+
+def _read_parts(directory, meta, columns=None):
+    paths = [os.path.join(directory, name) for name in meta['files']]
+    return pq.read_table(paths, columns=list(columns) if columns else None, memory_map=True)
+
+
+# === PENANDA KESEGARAN ===
+def _key_value(value):
+    """MAX(key) dalam bentuk yang bisa disimpan di JSON: int untuk key integer, selain itu str."""
+    if value is None or pd.isna(value):
+        return None
+    if isinstance(value, numbers.Integral):
+        return int(value)
+    return str(value)
+
+
+def _count(table_name, engine):
+    with engine.connect() as conn:
+        return int(conn.execute(text(f"SELECT COUNT(*) FROM {table_name}")).scalar())
+
+
+def _source_fingerprint(table_name, key, engine):
+    """[COUNT(*), MAX(key), CHECKSUM TABLE (MySQL saja, selain itu None)]."""
+    with engine.connect() as conn:
+        rows, max_key = conn.execute(text(f"SELECT COUNT(*), MAX({key}) FROM {table_name}")).one()
+        checksum = None
+        if engine.dialect.name == 'mysql':
+            checksum = conn.execute(text(f"CHECKSUM TABLE {table_name}")).one()[1]
+    return [int(rows), _key_value(max_key), None if checksum is None else int(checksum)]
+
+
+def _watermark_to_json(watermark):
+    if watermark is None:
+        return None
+    return {'last_timestamp': watermark['last_timestamp'].isoformat(), 'last_pk': watermark['last_pk']}
+
+
+def _watermark_from_json(value):
+    if value is None:
+        return None
+    return {'last_timestamp': pd.Timestamp(value['last_timestamp']), 'last_pk': value['last_pk']}
+
+
+# === SYNC ===
+def _full_refresh(table_name, key, ts_column, directory, meta_path, meta, engine):
+    fingerprint = None if ts_column else _source_fingerprint(table_name, key, engine)
+    df = pd.read_sql(f"SELECT * FROM {table_name}", engine)
+    os.makedirs(directory, exist_ok=True)
+
+    part = meta['next_part'] if meta else 0
+    name = _write_part(directory, part, pa.Table.from_pandas(df, preserve_index=False))
+    watermark = watermark_from_rows(df, ts_column, key) if ts_column and not df.empty else None
+    _write_meta(meta_path, {
+        'key': key, 'ts': ts_column, 'rows': len(df), 'files': [name], 'next_part': part + 1,
+        'watermark': _watermark_to_json(watermark), 'fingerprint': fingerprint,
+    })
+    _remove_unlisted(directory, [name])
+    print(f"[SNAPSHOT] {table_name}: snapshot penuh dibuat ({len(df)} baris)")
+
+
+def _apply_delta(table_name, key, ts_column, meta, delta, source_rows, directory, meta_path):
+    """
+    Terapkan delta (baris setelah watermark) ke snapshot: baris baru jadi part
+    baru, baris yang pk-nya sudah ada menggantikan versi lama. False kalau
+    hasilnya tidak konsisten dengan source (snapshot harus dibuat ulang).
+    """
+    schema = pq.read_schema(os.path.join(directory, meta['files'][0]))
+    try:
+        batch = pa.Table.from_pandas(delta, schema=schema, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, KeyError):
+        return False
+
+    part = meta['next_part']
+    delta_keys = pa.array(delta[key].tolist())
+    updated = pc.sum(pc.is_in(_read_parts(directory, meta, [key])[key], value_set=delta_keys)).as_py() or 0
+    if updated:
+        # Versi lama baris yang di-update dibuang, snapshot ditulis ulang jadi satu part
+        current = _read_parts(directory, meta).cast(schema)
+        current = current.filter(pc.invert(pc.is_in(current[key], value_set=delta_keys)))
+        if current.num_rows + batch.num_rows != source_rows:
+            return False
+        files = [_write_part(directory, part, pa.concat_tables([current, batch]))]
+    else:
+        if meta['rows'] + batch.num_rows != source_rows:
+            return False
+        files = meta['files'] + [_write_part(directory, part, batch)]
+
+    watermark = watermark_from_rows(delta, ts_column, key)
+    _write_meta(meta_path, {
+        **meta, 'rows': source_rows, 'files': files, 'next_part': part + 1,
+        'watermark': _watermark_to_json(watermark),
+    })
+    _remove_unlisted(directory, files)
+    print(f"[SNAPSHOT] {table_name}: delta {len(delta)} baris ({updated} update) diterapkan")
+    return True
+
+
+def _sync_watermark(table_name, key, ts_column, meta, directory, meta_path, engine):
+    watermark = _watermark_from_json(meta['watermark'])
+    if watermark is None:
+        clause, params = f"{ts_column} IS NOT NULL", {}
+    else:
+        clause, params = cdc_filter(ts_column, key, watermark)
+    source_rows = _count(table_name, engine)
+    delta = pd.read_sql(text(f"SELECT * FROM {table_name} WHERE {clause}"), engine, params=params)
+
+    if delta.empty:
+        if source_rows != meta['rows']:
+            _full_refresh(table_name, key, ts_column, directory, meta_path, meta, engine)
+        return
+    if not _apply_delta(table_name, key, ts_column, meta, delta, source_rows, directory, meta_path):
+        _full_refresh(table_name, key, ts_column, directory, meta_path, meta, engine)
+
+
+def sync_snapshot(table_name, engine):
+    """Pastikan snapshot table_name sesuai source (pakai, terapkan delta, atau buat ulang)."""
+    key = SNAPSHOT_KEYS.get(table_name, 'id')
+    ts_column = SNAPSHOT_WATERMARKS.get(table_name)
+    directory, meta_path = _paths(table_name)
+    meta = _read_meta(meta_path)
+
+    if meta is None or meta.get('key') != key or meta.get('ts') != ts_column or 'files' not in meta:
+        _full_refresh(table_name, key, ts_column, directory, meta_path, meta if meta and 'next_part' in meta else None, engine)
+    elif ts_column:
+        _sync_watermark(table_name, key, ts_column, meta, directory, meta_path, engine)
+    elif _source_fingerprint(table_name, key, engine) != meta['fingerprint']:
+        _full_refresh(table_name, key, ts_column, directory, meta_path, meta, engine)
+
+
+def read_snapshot(table_name, engine, columns=None):
+    """Baca table_name dari snapshot lokal (disinkronkan dulu), hanya kolom columns."""
+    with _table_lock(table_name):
+        sync_snapshot(table_name, engine)
+        directory, meta_path = _paths(table_name)
+        table = _read_parts(directory, _read_meta(meta_path), columns)
+    return table.to_pandas()
@@ -0,0 +1,38 @@
+"""
+Staging table sementara untuk operasi set-based (UPDATE ... JOIN, upsert).
+
+DataFrame ditulis ke TEMPORARY TABLE di koneksi yang sama dengan transaksi
+loader, lalu satu statement SQL menggabungkannya ke tabel target. Temporary
+table hilang sendiri saat koneksi kembali ke pool / ditutup.
+"""
+from sqlalchemy import text
+
+from pipeline.bulk_load import bulk_load
+
+
+def stage_frame(df, like_table, conn, name=None, index_columns=None):
+    """
+    Buat TEMPORARY TABLE berisi df dengan tipe kolom mengikuti like_table,
+    kembalikan namanya. index_columns (opsional) diberi index untuk join.
+    """
+    name = name or f"stg_{like_table}"
+    columns = ', '.join(f'`{c}`' for c in df.columns)
+
+    # Index dideklarasikan langsung di CREATE TEMPORARY TABLE: ALTER TABLE (juga
+    # untuk temporary table) memicu implicit commit di MySQL dan memutus
+    # transaksi loader yang sedang berjalan
+    index = f"(INDEX ({', '.join(index_columns)})) " if index_columns else ""
+    conn.execute(text(f"DROP TEMPORARY TABLE IF EXISTS {name}"))
+    conn.execute(text(f"CREATE TEMPORARY TABLE {name} {index}SELECT {columns} FROM {like_table} WHERE 1 = 0"))
+
+    bulk_load(df, name, conn)
+    return name
+
+
+def join_condition(left, right, columns, null_safe=False):
+    """
+    'left.a = right.a AND left.b = right.b' untuk klausa JOIN ... ON.
+    null_safe=True memakai <=> sehingga NULL dianggap sama dengan NULL.
+    """
+    op = '<=>' if null_safe else '='
+    return ' AND '.join(f"{left}.{c} {op} {right}.{c}" for c in columns)
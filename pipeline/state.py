@@ -0,0 +1,132 @@
+"""
+State watermark ETL di tabel etl_state (database OLAP).
+
+Satu baris per (loader, source_table) berisi timestamp dan primary key terakhir
+yang sudah dimuat. Loader incremental membacanya dengan satu lookup PK, lalu
+mengekstrak baris dengan (ts, pk) > (last_timestamp, last_pk), sehingga baris
+terlambat di hari yang sama tetap terbawa. Update state dilakukan di transaksi
+yang sama dengan load fact.
+"""
+import pandas as pd
+from sqlalchemy import text
+
+STATE_TABLE = 'etl_state'
+
+STATE_DDL = f"""
+    CREATE TABLE IF NOT EXISTS {STATE_TABLE} (
+        loader VARCHAR(64) NOT NULL,
+        source_table VARCHAR(64) NOT NULL,
+        last_timestamp DATETIME NULL,
+        last_pk BIGINT NULL,
+        rows_loaded BIGINT NOT NULL DEFAULT 0,
+        updated_at DATETIME NOT NULL,
+        PRIMARY KEY (loader, source_table)
+    )
+"""
+
+
+def ensure_state_table(engine):
+    with engine.begin() as conn:
+        conn.execute(text(STATE_DDL))
+
+
+def get_watermark(loader, source_table, engine):
+    """
+    Kembalikan {'last_timestamp': pd.Timestamp, 'last_pk': int|None}
+    atau None jika loader belum pernah mencatat state.
+    """
+    ensure_state_table(engine)
+    df = pd.read_sql(
+        text(f"""
+            SELECT last_timestamp, last_pk
+            FROM {STATE_TABLE}
+            WHERE loader = :loader AND source_table = :source_table
+        """),
+        engine,
+        params={'loader': loader, 'source_table': source_table},
+    )
+    if df.empty or pd.isna(df.at[0, 'last_timestamp']):
+        return None
+
+    last_pk = df.at[0, 'last_pk']
+    return {
+        'last_timestamp': pd.Timestamp(df.at[0, 'last_timestamp']),
+        'last_pk': int(last_pk) if pd.notna(last_pk) else None,
+    }
+
+
+def set_watermark(conn, loader, source_table, watermark, rows_loaded=0):
+    """
+    Simpan watermark baru. conn adalah koneksi dari engine.begin() yang juga
+    dipakai untuk load, supaya state dan data fact commit (atau rollback) bersama.
+    """
+    conn.execute(
+        text(f"""
+            INSERT INTO {STATE_TABLE}
+                (loader, source_table, last_timestamp, last_pk, rows_loaded, updated_at)
+            VALUES (:loader, :source_table, :last_timestamp, :last_pk, :rows_loaded, NOW())
+            ON DUPLICATE KEY UPDATE
+                last_timestamp = VALUES(last_timestamp),
+                last_pk = VALUES(last_pk),
+                rows_loaded = rows_loaded + VALUES(rows_loaded),
+                updated_at = VALUES(updated_at)
+        """),
+        {
+            'loader': loader,
+            'source_table': source_table,
+            'last_timestamp': watermark['last_timestamp'].to_pydatetime(),
+            'last_pk': watermark['last_pk'],
+            'rows_loaded': int(rows_loaded),
+        },
+    )
+
+
+def clear_watermark(conn, loader, source_table):
+    """Hapus state (loader, source_table), mis. checkpoint yang sudah selesai dipakai."""
+    conn.execute(
+        text(f"DELETE FROM {STATE_TABLE} WHERE loader = :loader AND source_table = :source_table"),
+        {'loader': loader, 'source_table': source_table},
+    )
+
+
+def reset_loader_state(conn, loader):
+    """
+    Hapus semua state milik loader, termasuk checkpoint turunannya
+    ('<loader>:stream', ...). Dipakai saat full load historis mengganti isi fakta.
+    Prefix dibandingkan dengan SUBSTR, bukan LIKE: '_' di nama loader adalah
+    wildcard LIKE dan bisa ikut menghapus state loader lain.
+    """
+    prefix = f"{loader}:"
+    conn.execute(
+        text(f"""
+            DELETE FROM {STATE_TABLE}
+            WHERE loader = :loader OR SUBSTR(loader, 1, :n) = :prefix
+        """),
+        {'loader': loader, 'prefix': prefix, 'n': len(prefix)},
+    )
+
+
+def watermark_from_rows(df, ts_column, pk_column):
+    """(timestamp, pk) terbesar dari baris yang sudah diekstrak, atau None jika kosong."""
+    ts = pd.to_datetime(df[ts_column], errors='coerce')
+    if ts.isna().all():
+        return None
+    last_ts = ts.max()
+    last_pk = df.loc[ts == last_ts, pk_column].max()
+    return {'last_timestamp': pd.Timestamp(last_ts), 'last_pk': int(last_pk)}
+
+
+def cdc_filter(ts_column, pk_column, watermark):
+    """
+    Klausa WHERE + params untuk mengambil baris setelah watermark.
+    Tanpa last_pk (mis. hasil bootstrap dari fact lama) cukup ts > last_timestamp.
+    """
+    params = {'wm_ts': watermark['last_timestamp'].to_pydatetime()}
+    if watermark['last_pk'] is None:
+        return f"{ts_column} > :wm_ts", params
+
+    params['wm_pk'] = watermark['last_pk']
+    clause = (
+        f"({ts_column} > :wm_ts OR ({ts_column} = :wm_ts AND {pk_column} > :wm_pk))"
+    )
+    return clause, params
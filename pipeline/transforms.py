@@ -0,0 +1,121 @@
+"""
+Transformasi vektor yang dipakai bersama loader dim_* dan fact_*.
+
+Pengganti apply(lambda ...) per baris:
+- flag 1/0 dari perbandingan teks (is_drop, is_frs_disetujui) dan dari hasil
+  merge indicator (sudah_bayar_flag) dihitung dengan operasi array;
+- pembersih nama (clean_dosen, normalize_degree, clean_text) memakai
+  str accessor / regex, dan hanya dijalankan pada nilai unik lalu disebar
+  balik lewat kode factorize, jadi biayanya mengikuti jumlah nama berbeda,
+  bukan jumlah baris;
+- agregasi per grup (group_first_and_sums) menghitung beberapa jumlah
+  bersyarat sekaligus dalam satu pass, tanpa groupby terpisah lalu merge.
+"""
+import numpy as np
+import pandas as pd
+
+# Urutan penggantian sama dengan versi per baris sebelumnya (str.replace berurutan)
+DOSEN_REPLACEMENTS = [
+    ('.', '. '), ('  ', ' '),
+    ('St ', 'St. '), ('Dr ', 'Dr. '), ('Phd', 'Ph.D'), ('Ph.D.', 'Ph.D'),
+    ('Mkom', 'M.Kom'), ('Skom', 'S.Kom'), ('Spt', 'S.Pt'),
+]
+
+DEGREE_REPLACEMENTS = [
+    ('S.T', 'ST'), ('S.T.', 'ST'),
+    ('M.T', 'MT'), ('M.T.', 'MT'),
+    ('Ph.D', 'PhD'), ('Ph.D.', 'PhD'),
+]
+
+
+def on_uniques(values, func):
+    """
+    Jalankan func (Series -> Series, vektor) hanya pada nilai unik values,
+    lalu sebar hasilnya ke semua baris. NULL tetap NULL.
+    """
+    values = pd.Series(values)
+    codes, uniques = pd.factorize(values)
+    cleaned = func(pd.Series(uniques, dtype=object)).to_numpy(dtype=object)
+    out = np.empty(len(values), dtype=object)
+    found = codes >= 0
+    out[found] = cleaned[codes[found]]
+    out[~found] = values[~found].to_numpy(dtype=object)
+    return pd.Series(out, index=values.index, name=values.name)
+
+
+def _replace_all(s, replacements):
+    for old, new in replacements:
+        s = s.str.replace(old, new, regex=False)
+    return s
+
+
+def clean_dosen(names):
+    """Nama dosen: strip, title case, rapikan titik dan gelar (M.Kom, Ph.D, ...)."""
+    return on_uniques(
+        names,
+        lambda s: _replace_all(s.str.strip().str.title(), DOSEN_REPLACEMENTS).str.strip(),
+    )
+
+
+def normalize_degree(names):
+    """Seragamkan penulisan gelar (S.T → ST, Ph.D → PhD, ...)."""
+    return on_uniques(names, lambda s: _replace_all(s, DEGREE_REPLACEMENTS))
+
+
+def clean_text(values):
+    """Strip, title case, dan ringkas spasi berulang jadi satu."""
+    return on_uniques(
+        values,
+        lambda s: s.str.strip().str.title().str.replace(r'\s+', ' ', regex=True),
+    )
+
+
+def equals_upper(values, target):
+    """
+    Mask boolean str(v).upper() == target, dihitung di nilai unik (cocok untuk
+    category). NULL selalu False.
+    """
+    codes, uniques = pd.factorize(pd.Series(values))
+    if len(uniques) == 0:
+        return np.zeros(len(codes), dtype=bool)
+    matches = pd.Series(uniques, dtype=object).astype(str).str.upper().to_numpy() == target
+    return (codes >= 0) & matches[codes]
+
+
+def flag(mask):
+    """Mask boolean → kolom integer 1/0."""
+    return np.asarray(mask, dtype=bool).astype(int)
+
+
+def merge_flag(indicator):
+    """Kolom _merge dari merge(..., indicator=True) → 1 kalau 'both', selain itu 0."""
+    indicator = pd.Series(indicator)
+    if isinstance(indicator.dtype, pd.CategoricalDtype):
+        # _merge selalu category: cukup bandingkan kode integernya
+        return flag(indicator.cat.codes.to_numpy() == indicator.cat.categories.get_loc('both'))
+    return flag(indicator.to_numpy() == 'both')
+
+
+def group_first_and_sums(df, keys, sums):
+    """
+    Agregasi satu pass: baris pertama tiap grup keys (urutan kemunculan, sama
+    dengan drop_duplicates(subset=keys)) plus kolom jumlah bersyarat.
+
+    sums: {nama kolom hasil: bobot per baris}, mis. mask ADD untuk hitungan
+    atau sks.where(mask, 0) untuk jumlah sks. Kode grup dihitung sekali, lalu
+    setiap jumlah cukup np.bincount di atas kode itu.
+
+    Grup dengan key NULL tetap muncul (seperti drop_duplicates) tetapi jumlahnya
+    0, sama dengan groupby(...).size() + merge yang membuang key NULL.
+    """
+    codes = df.groupby(keys, dropna=False, sort=False).ngroup().to_numpy()
+    first = ~pd.Series(codes).duplicated().to_numpy()
+    n_groups = int(first.sum())
+    valid = df[keys].notna().all(axis=1).to_numpy()[first]
+
+    result = df[first].copy()
+    for name, weights in sums.items():
+        weights = pd.Series(weights).fillna(0).to_numpy(dtype=float)
+        totals = np.bincount(codes, weights=weights, minlength=n_groups)
+        result[name] = np.where(valid, totals, 0).astype(int)
+    return result
@@ -0,0 +1,81 @@
+"""
+Deteksi perubahan vektor dan update set-based untuk dimensi non-SCD2.
+
+diff_columns() membandingkan versi lama dan baru per kolom sekaligus (mask
+boolean, tanpa iterrows), row_fingerprint() meringkas isi baris jadi satu
+hash, classify_rows() memisahkan baris baru dan berubah per natural key, lalu
+staged_update() menerapkan semua perubahan dengan satu UPDATE ... JOIN ke
+staging table.
+"""
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+from sqlalchemy import text
+
+from pipeline.staging import join_condition, stage_frame
+
+
+def row_fingerprint(df, columns):
+    """
+    Hash uint64 per baris dari columns. Angka dibandingkan sebagai float
+    (30 == 30.0) dan NULL dianggap sama dengan NULL.
+    """
+    normalized = pd.DataFrame(index=df.index)
+    for col in columns:
+        if is_numeric_dtype(df[col]):
+            normalized[col] = df[col].astype('float64')
+        else:
+            # astype(object) dulu: kolom category tidak bisa fillna dengan nilai di luar kategorinya
+            normalized[col] = df[col].astype(object).fillna('').astype(str)
+    return pd.util.hash_pandas_object(normalized, index=False).to_numpy()
+
+
+def classify_rows(df_existing, df_new, key_column, columns):
+    """
+    Mask (is_new, is_changed) untuk baris df_new terhadap df_existing per
+    key_column (unik di kedua sisi). Hash isi hanya dibandingkan untuk key yang
+    ada di df_existing; key baru tidak pernah dianggap berubah.
+    """
+    pos = pd.Index(df_existing[key_column]).get_indexer(df_new[key_column])
+    is_new = pos < 0
+    is_changed = np.zeros(len(pos), dtype=bool)
+    matched = ~is_new
+    if matched.any():
+        existing_hash = row_fingerprint(df_existing, columns)
+        new_hash = row_fingerprint(df_new, columns)
+        is_changed[matched] = new_hash[matched] != existing_hash[pos[matched]]
+    return is_new, is_changed
+
+
+def diff_columns(df_joined, columns, suffixes=('_new', '_old')):
+    """
+    Mask perubahan per kolom untuk hasil merge versi baru & lama.
+    Kembalikan DataFrame boolean (satu kolom per columns); NULL vs NULL dianggap sama.
+    """
+    new_suffix, old_suffix = suffixes
+    masks = {}
+    for col in columns:
+        new = df_joined[f'{col}{new_suffix}']
+        old = df_joined[f'{col}{old_suffix}']
+        masks[col] = (new != old) & ~(new.isna() & old.isna())
+    return pd.DataFrame(masks, index=df_joined.index)
+
+
+def staged_update(df, table, key_columns, update_columns, conn):
+    """
+    UPDATE table dari df (key_columns + update_columns) dalam satu statement:
+    df ditulis ke temporary staging table lalu di-JOIN ke table.
+    Kembalikan jumlah baris yang berubah menurut server.
+    """
+    if df.empty:
+        return 0
+
+    key_columns = list(key_columns)
+    staging = stage_frame(df[key_columns + list(update_columns)], table, conn, index_columns=key_columns)
+    assignments = ', '.join(f"t.{c} = s.{c}" for c in update_columns)
+    result = conn.execute(text(f"""
+        UPDATE {table} t
+        JOIN {staging} s ON {join_condition('t', 's', key_columns)}
+        SET {assignments}
+    """))
+    return result.rowcount
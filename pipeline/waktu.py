@@ -0,0 +1,67 @@
+"""
+Kalender untuk dim_waktu.
+
+Tanggal unik diambil langsung di source dengan SELECT DISTINCT DATE(kolom)
+(satu query UNION untuk semua kolom tanggal), lalu atribut kalender dihitung
+sekaligus untuk seluruh tanggal secara vektor, tanpa apply per baris.
+date_span() melengkapi rentang tanggal jadi kalender harian tanpa lubang.
+"""
+import numpy as np
+import pandas as pd
+
+from pipeline.extract import read_query
+from pipeline.manifest import to_datetime_ns
+
+# Kolom tanggal di source OLTP yang harus punya baris di dim_waktu
+DATE_SOURCES = [
+    ('frs', 'tanggal_disetujui'),
+    ('pembayaran', 'tanggal_bayar'),
+    ('detail_frs', 'tanggal'),
+    ('pembatalan_frs', 'tanggal_pengajuan'),
+]
+
+CALENDAR_COLUMNS = ['tanggal', 'hari', 'bulan', 'tahun', 'semester_akademik']
+
+
+def extract_distinct_dates(engine, sources=DATE_SOURCES):
+    """Tanggal unik (tanpa jam) dari semua kolom sources, sebagai DatetimeIndex terurut."""
+    sql = "\nUNION\n".join(
+        f"SELECT DISTINCT DATE({column}) AS tanggal FROM {table} WHERE {column} IS NOT NULL"
+        for table, column in sources
+    )
+    df = read_query(sql, engine)
+    print(f"[WAKTU] {len(df)} tanggal unik dari {len(sources)} kolom source")
+    return normalize_dates(df['tanggal'])
+
+
+def normalize_dates(values):
+    """
+    Ubah values jadi DatetimeIndex (datetime64[ns]) tanggal unik terurut.
+    Nilai kosong atau di luar jangkauan datetime64[ns] (mis. 9999-12-31) dibuang
+    (pipeline.manifest.to_datetime_ns).
+    """
+    dates = to_datetime_ns(values).dropna()
+    return pd.DatetimeIndex(dates).normalize().unique().sort_values()
+
+
+def build_calendar(dates):
+    """Baris dim_waktu (tanpa waktu_id) untuk setiap tanggal di dates."""
+    dates = normalize_dates(dates)
+    return pd.DataFrame({
+        'tanggal': dates.date,
+        'hari': dates.day_name(),
+        'bulan': dates.month_name(),
+        'tahun': dates.year,
+        'semester_akademik': np.where(dates.month <= 6, 'Genap', 'Ganjil'),
+    }, columns=CALENDAR_COLUMNS)
+
+
+def date_span(dates):
+    """
+    Semua tanggal dari tanggal paling awal sampai paling akhir di dates (tanpa
+    lubang), supaya dim_waktu punya baris untuk setiap hari di rentang data.
+    """
+    dates = normalize_dates(dates)
+    if dates.empty:
+        return dates
+    return pd.date_range(dates[0], dates[-1], freq='D')
@@ -0,0 +1,167 @@
+import asyncio
+import threading
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+
+from pipeline import async_extract
+from pipeline.extract import extract_many, read_query, read_table, read_table_where_in
+
+
+@pytest.fixture
+def engine(tmp_path):
+    # File SQLite, bukan :memory:, supaya engine sync dan async melihat data yang sama
+    engine = create_engine(f"sqlite:///{tmp_path / 'frs.db'}")
+    pd.DataFrame({
+        'id': range(1, 2501),
+        'nrp': [f"50251{i:05d}" for i in range(2500)],
+        'semester': [i % 8 + 1 for i in range(2500)],
+    }).to_sql('frs', engine, index=False)
+    pd.DataFrame({
+        'id': range(1, 5001),
+        'frs_id': [i % 2500 + 1 for i in range(5000)],
+        'action': ['ADD' if i % 5 else 'DROP' for i in range(5000)],
+    }).to_sql('detail_frs', engine, index=False)
+    yield engine
+    engine.dispose()
+
+
+def _extract_all(engine):
+    tables = extract_many({name: (lambda name=name: read_table(name, engine)) for name in ['frs', 'detail_frs']})
+    tables['detail_frs_where_in'] = read_table_where_in('detail_frs', 'frs_id', range(1, 1801, 2), engine, chunk_size=250)
+    return tables
+
+
+def _sorted(df):
+    return df.sort_values('id', ignore_index=True)
+
+
+@pytest.fixture
+def async_backend(monkeypatch):
+    pytest.importorskip('greenlet')
+    pytest.importorskip('aiosqlite')
+    monkeypatch.setenv(async_extract.BACKEND_ENV, 'async')
+
+
+def test_async_matches_thread(engine, async_backend, monkeypatch):
+    assert async_extract.is_enabled(engine)
+    result_async = _extract_all(engine)
+
+    monkeypatch.setenv(async_extract.BACKEND_ENV, 'thread')
+    result_thread = _extract_all(engine)
+
+    assert result_async.keys() == result_thread.keys()
+    for name in result_thread:
+        pd.testing.assert_frame_equal(_sorted(result_async[name]), _sorted(result_thread[name]))
+
+
+def test_async_error_propagates(engine, async_backend, monkeypatch):
+    with pytest.raises(Exception) as error_async:
+        read_query("SELECT * FROM tabel_tidak_ada", engine)
+
+    monkeypatch.setenv(async_extract.BACKEND_ENV, 'thread')
+    with pytest.raises(Exception) as error_thread:
+        read_query("SELECT * FROM tabel_tidak_ada", engine)
+
+    assert type(error_async.value) is type(error_thread.value)
+    assert 'tabel_tidak_ada' in str(error_async.value)
+
+
+def test_async_falls_back_without_driver(engine, monkeypatch):
+    monkeypatch.setenv(async_extract.BACKEND_ENV, 'async')
+    monkeypatch.setattr(async_extract, 'create_async_engine', None)
+
+    assert not async_extract.is_enabled(engine)
+    assert len(read_table('frs', engine)) == 2500
+
+
+class FakeAsyncEngine:
+    """
+    Pengganti async engine tanpa driver: run_sync menjalankan fungsi di atas
+    koneksi sync biasa, setelah await supaya query bersamaan saling menyela.
+    Mencatat thread dan jumlah query yang aktif bersamaan.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.threads = set()
+        self.active = 0
+        self.max_active = 0
+
+    def connect(self):
+        return FakeAsyncConnection(self)
+
+
+class FakeAsyncConnection:
+    def __init__(self, fake):
+        self.fake = fake
+
+    async def __aenter__(self):
+        self.conn = self.fake.engine.connect()
+        return self
+
+    async def __aexit__(self, *exc):
+        self.conn.close()
+
+    async def run_sync(self, func):
+        fake = self.fake
+        fake.threads.add(threading.current_thread().name)
+        fake.active += 1
+        fake.max_active = max(fake.max_active, fake.active)
+        try:
+            await asyncio.sleep(0.01)
+            return func(self.conn)
+        finally:
+            fake.active -= 1
+
+
+@pytest.fixture
+def fake_backend(engine, monkeypatch):
+    fake = FakeAsyncEngine(engine)
+    semaphores = {}
+
+    def get_async_engine(sync_engine):
+        # Semaphore dibuat di thread event loop, sama seperti _get_async_engine
+        semaphore = semaphores.setdefault('limit', asyncio.Semaphore(3))
+        return fake, semaphore
+
+    monkeypatch.setattr(async_extract, '_get_async_engine', get_async_engine)
+    monkeypatch.setattr(async_extract, 'is_enabled', lambda sync_engine: True)
+    return fake
+
+
+def test_read_sql_many_runs_on_event_loop_thread(engine, fake_backend):
+    queries = [(f"SELECT * FROM frs WHERE semester = {s}", None) for s in range(1, 9)]
+
+    frames = async_extract.read_sql_many(queries, engine)
+
+    assert fake_backend.threads == {'extract-async'}
+    # Query bersamaan, tapi tidak lebih dari batas semaphore
+    assert 1 < fake_backend.max_active <= 3
+    for (sql, _), df in zip(queries, frames):
+        pd.testing.assert_frame_equal(df, pd.read_sql(sql, engine))
+
+
+def test_fake_async_matches_thread(engine, fake_backend, monkeypatch):
+    result_async = _extract_all(engine)
+
+    monkeypatch.setattr(async_extract, 'is_enabled', lambda sync_engine: False)
+    result_thread = _extract_all(engine)
+
+    assert fake_backend.threads == {'extract-async'}
+    for name in result_thread:
+        pd.testing.assert_frame_equal(_sorted(result_async[name]), _sorted(result_thread[name]))
+
+
+def test_fake_async_error_propagates(engine, fake_backend, monkeypatch):
+    with pytest.raises(Exception) as error_async:
+        read_query("SELECT * FROM tabel_tidak_ada", engine)
+
+    monkeypatch.setattr(async_extract, 'is_enabled', lambda sync_engine: False)
+    with pytest.raises(Exception) as error_thread:
+        read_query("SELECT * FROM tabel_tidak_ada", engine)
+
+    assert type(error_async.value) is type(error_thread.value)
+    # Event loop tetap hidup setelah query gagal
+    assert len(async_extract.read_sql("SELECT * FROM frs", engine)) == 2500
@@ -0,0 +1,24 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from pipeline.dim_cache import DimIndex
+
+
+def test_lookup_date_ignores_time_part():
+    index = DimIndex('dim_waktu', [date(2024, 1, 1), date(2024, 1, 2)], [10, 11])
+
+    ids = index.lookup([pd.Timestamp('2024-01-02 13:00'), pd.Timestamp('2024-01-01 00:00:01'), None])
+
+    np.testing.assert_array_equal(ids[:2], [11, 10])
+    assert np.isnan(ids[2])
+
+
+def test_lookup_str_missing_key_is_nan():
+    index = DimIndex('dim_mahasiswa', ['5026231007', '5026231008'], [1, 2])
+
+    ids = index.lookup(['5026231008', '5026239999'])
+
+    assert ids[0] == 2
+    assert np.isnan(ids[1])
@@ -0,0 +1,23 @@
+import pandas as pd
+
+from pipeline import ipk
+
+
+def test_normalize_drops_rows_without_semester():
+    df = pd.DataFrame({'nrp': [5026231007, 5026231007], 'semester': [1, None],
+                       'nilai_sum': [3.5, 4.0], 'nilai_count': [1, 1]})
+
+    out = ipk._normalize(df)
+
+    assert out['nrp'].tolist() == ['5026231007']
+    assert out['semester'].tolist() == [1]
+
+
+def test_lookup_uses_previous_semesters_only(monkeypatch):
+    source = ipk._normalize(pd.DataFrame({'nrp': ['1', '1'], 'semester': [1, 2],
+                                          'nilai_sum': [3.0, 4.0], 'nilai_count': [1, 1]}))
+    monkeypatch.setattr(ipk, '_table', ipk.with_cumulative(source))
+
+    out = ipk.lookup_ipk(pd.Series(['1', '1', '1', '2']), pd.Series([1, 3, None, 2]))
+
+    assert out.tolist() == [0.0, 3.5, 0.0, 0.0]
@@ -0,0 +1,71 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from pipeline.manifest import apply_dtypes
+
+# Memori setelah kebijakan tipe harus <= (1 - MIN_REDUCTION) x memori mentah
+MIN_REDUCTION = 0.5
+
+
+def _raw_detail_frs(n=20_000, seed=0):
+    """detail_frs sintetis dengan tipe seperti hasil pd.read_sql mentah."""
+    rng = np.random.default_rng(seed)
+    days = np.array([date(2023, 1, 1) + timedelta(days=d) for d in range(365)], dtype=object)
+    return pd.DataFrame({
+        'id': np.arange(1, n + 1),
+        'frs_id': rng.integers(1, 5_000, n),
+        'kelas_id': rng.integers(1, 500, n),
+        'semester': rng.integers(1, 9, n),
+        'action': np.where(rng.random(n) < 0.8, 'ADD', 'DROP').astype(object),
+        'kode_mata_kuliah': np.array([f"IF{184100 + i}" for i in range(300)], dtype=object)[rng.integers(0, 300, n)],
+        'tanggal': days[rng.integers(0, len(days), n)],
+    })
+
+
+def test_apply_dtypes_reduces_memory():
+    raw = _raw_detail_frs()
+    typed = apply_dtypes(raw.copy())
+
+    mem_raw = raw.memory_usage(deep=True).sum()
+    mem_typed = typed.memory_usage(deep=True).sum()
+    assert mem_typed <= (1 - MIN_REDUCTION) * mem_raw
+
+    assert typed['id'].dtype == 'Int32'
+    assert typed['semester'].dtype == 'Int16'
+    assert isinstance(typed['action'].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_datetime64_any_dtype(typed['tanggal'])
+
+
+def test_apply_dtypes_keeps_values():
+    raw = _raw_detail_frs()
+    typed = apply_dtypes(raw.copy())
+
+    for col in ['id', 'frs_id', 'kelas_id', 'semester']:
+        np.testing.assert_array_equal(typed[col].to_numpy('int64'), raw[col].to_numpy())
+    for col in ['action', 'kode_mata_kuliah']:
+        assert typed[col].astype(object).tolist() == raw[col].tolist()
+    assert typed['tanggal'].dt.date.tolist() == raw['tanggal'].tolist()
+
+
+def test_apply_dtypes_widens_large_ints():
+    df = apply_dtypes(pd.DataFrame({'id': [1, 2**40], 'frs_id': [1, None]}))
+
+    assert df['id'].dtype == 'Int64'
+    assert df['id'].tolist() == [1, 2**40]
+    assert df['frs_id'].dtype == 'Int32'
+    assert df['frs_id'].isna().tolist() == [False, True]
+
+
+def test_apply_dtypes_sentinel_dates_become_nat():
+    df = apply_dtypes(pd.DataFrame({
+        'tanggal': [date(2024, 2, 1), date(9999, 12, 31), date(1, 1, 1), None, 'bukan tanggal'],
+        'tanggal_disetujui': [date(2262, 4, 11), date(1677, 9, 22), None, None, None],
+    }))
+
+    assert df['tanggal'].dtype == 'datetime64[ns]'
+    assert df['tanggal'].isna().tolist() == [False, True, True, True, True]
+    assert df['tanggal'][0] == pd.Timestamp(2024, 2, 1)
+    # Batas jangkauan datetime64[ns] masih valid
+    assert df['tanggal_disetujui'].notna().tolist() == [True, True, False, False, False]
@@ -0,0 +1,94 @@
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+
+pytest.importorskip('pyarrow')
+
+from pipeline import snapshot  # noqa: E402
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    monkeypatch.setenv(snapshot.SNAPSHOT_DIR_ENV, str(tmp_path / 'snapshot'))
+    engine = create_engine(f"sqlite:///{tmp_path / 'frs.db'}")
+    # Tanggal sebagai teks 'YYYY-MM-DD HH:MM:SS', format yang sama dengan parameter datetime sqlite3
+    pd.DataFrame({
+        'id': [1, 2, 3],
+        'frs_id': [10, 10, 11],
+        'action': ['ADD', 'ADD', 'DROP'],
+        'tanggal': ['2024-01-01 08:00:00', '2024-01-02 08:00:00', '2024-01-02 08:00:00'],
+    }).to_sql('detail_frs', engine, index=False)
+    pd.DataFrame({
+        'kode_mata_kuliah': ['IF184100', 'IF184101'],
+        'nama': ['Basis Data', 'Jaringan'],
+        'sks': [3, 4],
+    }).to_sql('mata_kuliah', engine, index=False)
+    yield engine
+    engine.dispose()
+
+
+def _execute(engine, sql):
+    with engine.begin() as conn:
+        conn.execute(text(sql))
+
+
+def _assert_same(engine, table, key):
+    df = snapshot.read_snapshot(table, engine)
+    expected = pd.read_sql(f"SELECT * FROM {table}", engine)
+    pd.testing.assert_frame_equal(df.sort_values(key, ignore_index=True), expected.sort_values(key, ignore_index=True))
+
+
+def _meta(table):
+    return snapshot._read_meta(snapshot._paths(table)[1])
+
+
+def test_full_refresh_then_reuse(engine, capsys):
+    _assert_same(engine, 'detail_frs', 'id')
+    assert _meta('detail_frs')['watermark'] == {'last_timestamp': '2024-01-02T08:00:00', 'last_pk': 3}
+
+    capsys.readouterr()
+    _assert_same(engine, 'detail_frs', 'id')
+    assert '[SNAPSHOT]' not in capsys.readouterr().out
+
+
+def test_delta_append(engine):
+    _assert_same(engine, 'detail_frs', 'id')
+    _execute(engine, "INSERT INTO detail_frs VALUES (4, 12, 'ADD', '2024-01-03 08:00:00'), "
+                     "(5, 12, 'DROP', '2024-01-02 08:00:00')")
+
+    _assert_same(engine, 'detail_frs', 'id')
+    meta = _meta('detail_frs')
+    assert len(meta['files']) == 2
+    assert meta['rows'] == 5
+    assert meta['watermark'] == {'last_timestamp': '2024-01-03T08:00:00', 'last_pk': 4}
+
+
+def test_delta_replaces_updated_rows(engine, capsys):
+    _assert_same(engine, 'detail_frs', 'id')
+    _execute(engine, "UPDATE detail_frs SET action = 'DROP', tanggal = '2024-01-05 08:00:00' WHERE id = 1")
+
+    capsys.readouterr()
+    _assert_same(engine, 'detail_frs', 'id')
+    assert '(1 update)' in capsys.readouterr().out
+    meta = _meta('detail_frs')
+    assert len(meta['files']) == 1
+    assert meta['rows'] == 3
+
+
+def test_delete_triggers_full_refresh(engine, capsys):
+    _assert_same(engine, 'detail_frs', 'id')
+    _execute(engine, "DELETE FROM detail_frs WHERE id = 2")
+
+    capsys.readouterr()
+    _assert_same(engine, 'detail_frs', 'id')
+    assert 'snapshot penuh' in capsys.readouterr().out
+
+
+def test_string_key_table_refreshes_on_change(engine, capsys):
+    _assert_same(engine, 'mata_kuliah', 'kode_mata_kuliah')
+    assert _meta('mata_kuliah')['fingerprint'][:2] == [2, 'IF184101']
+
+    _execute(engine, "INSERT INTO mata_kuliah VALUES ('IF184102', 'Kecerdasan Buatan', 3)")
+    capsys.readouterr()
+    _assert_same(engine, 'mata_kuliah', 'kode_mata_kuliah')
+    assert 'snapshot penuh' in capsys.readouterr().out
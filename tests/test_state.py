@@ -0,0 +1,25 @@
+from sqlalchemy import create_engine, text
+
+from pipeline.state import STATE_TABLE, ensure_state_table, reset_loader_state
+
+
+def test_reset_loader_state_keeps_loaders_matching_underscore():
+    engine = create_engine('sqlite://')
+    ensure_state_table(engine)
+    loaders = ['fact_pengambilan_kelas', 'fact_pengambilan_kelas:stream', 'fact_pengambilanXkelas:stream']
+    with engine.begin() as conn:
+        for loader in loaders:
+            conn.execute(
+                text(f"""
+                    INSERT INTO {STATE_TABLE} (loader, source_table, updated_at)
+                    VALUES (:loader, 'detail_frs', CURRENT_TIMESTAMP)
+                """),
+                {'loader': loader},
+            )
+
+    with engine.begin() as conn:
+        reset_loader_state(conn, 'fact_pengambilan_kelas')
+
+    with engine.connect() as conn:
+        left = conn.execute(text(f"SELECT loader FROM {STATE_TABLE}")).scalars().all()
+    assert left == ['fact_pengambilanXkelas:stream']
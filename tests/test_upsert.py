@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from pipeline.upsert import classify_rows
+
+
+def _dosen(rows):
+    return pd.DataFrame(rows, columns=['nama', 'email'])
+
+
+def test_classify_rows_empty_target():
+    df_existing = _dosen([])
+    df_new = _dosen([('Budi, S.Kom.', 'budi@its.ac.id'), ('Sari, M.T.', 'sari@its.ac.id')])
+
+    is_new, is_changed = classify_rows(df_existing, df_new, 'email', ['nama'])
+
+    assert is_new.tolist() == [True, True]
+    assert is_changed.tolist() == [False, False]
+
+
+def test_classify_rows_all_new():
+    # Key baru tidak boleh dibandingkan dengan hash baris existing mana pun
+    df_existing = _dosen([('Budi, S.Kom.', 'budi@its.ac.id')])
+    df_new = _dosen([('Budi, S.Kom.', 'andi@its.ac.id'), ('Sari, M.T.', 'sari@its.ac.id')])
+
+    is_new, is_changed = classify_rows(df_existing, df_new, 'email', ['nama'])
+
+    assert is_new.tolist() == [True, True]
+    assert is_changed.tolist() == [False, False]
+
+
+def test_classify_rows_mixed():
+    df_existing = _dosen([('Budi, S.Kom.', 'budi@its.ac.id'), ('Sari, M.T.', 'sari@its.ac.id')])
+    df_new = _dosen([
+        ('Sari, M.T.', 'sari@its.ac.id'),
+        ('Andi, M.Kom.', 'andi@its.ac.id'),
+        ('Budi, M.Kom.', 'budi@its.ac.id'),
+    ])
+
+    is_new, is_changed = classify_rows(df_existing, df_new, 'email', ['nama'])
+
+    np.testing.assert_array_equal(is_new, [False, True, False])
+    np.testing.assert_array_equal(is_changed, [False, False, True])
@@ -0,0 +1,34 @@
+from datetime import date, datetime
+
+import pandas as pd
+
+from pipeline.waktu import build_calendar, date_span, normalize_dates
+
+
+def test_normalize_dates_drops_out_of_range():
+    values = [date(2024, 2, 1), date(9999, 12, 31), None, datetime(2024, 2, 1, 13, 30), date(1, 1, 1)]
+
+    dates = normalize_dates(values)
+
+    assert list(dates) == [pd.Timestamp(2024, 2, 1)]
+    assert dates.dtype == 'datetime64[ns]'
+
+
+def test_normalize_dates_keeps_bounds():
+    dates = normalize_dates([date(2262, 4, 11), date(1677, 9, 22)])
+
+    assert list(dates) == [pd.Timestamp(1677, 9, 22), pd.Timestamp(2262, 4, 11)]
+
+
+def test_build_calendar_skips_sentinel_dates():
+    df = build_calendar([date(2024, 7, 15), date(9999, 12, 31)])
+
+    assert df['tanggal'].tolist() == [date(2024, 7, 15)]
+    assert df['semester_akademik'].tolist() == ['Ganjil']
+
+
+def test_date_span_fills_gaps():
+    dates = date_span([date(2024, 3, 4), datetime(2024, 3, 1, 9, 0), date(9999, 12, 31)])
+
+    assert list(dates) == list(pd.date_range('2024-03-01', '2024-03-04'))
+    assert date_span([]).empty